@@ -0,0 +1,79 @@
+import copy
+import threading
+import time
+
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+
+class UserCache:
+    """
+    Process-local cache of authenticated users with a short time to live.
+
+    Entries are dropped when the user is saved, deleted or logs out in this
+    process; the TTL bounds how long other processes can serve a stale user.
+    """
+
+    def __init__(self, ttl, maxsize):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        user_id = str(user_id)
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+        # Each request gets its own instance so views can modify it freely.
+        return copy.copy(user)
+
+    def set(self, user_id, user):
+        if self.ttl <= 0:
+            return
+        user_id = str(user_id)
+        with self._lock:
+            if len(self._entries) >= self.maxsize and user_id not in self._entries:
+                now = time.monotonic()
+                self._entries = {
+                    key: entry for key, entry in self._entries.items() if entry[0] > now
+                }
+                if len(self._entries) >= self.maxsize:
+                    self._entries.pop(next(iter(self._entries)))
+            self._entries[user_id] = (time.monotonic() + self.ttl, copy.copy(user))
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(
+    ttl=getattr(settings, "AUTH_USER_CACHE_TTL", 30),
+    maxsize=getattr(settings, "AUTH_USER_CACHE_SIZE", 1024),
+)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the token's user from ``user_cache``,
+    so repeated requests with the same token skip the user SELECT.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        user = user_cache.get(user_id) if user_id is not None else None
+        if user is None:
+            # Raises for unknown or inactive users, which are never cached.
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, user)
+        return user
@@ -0,0 +1,99 @@
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+
+class BlacklistFilter:
+    """
+    Process-local set of the JTIs of unexpired blacklisted tokens.
+
+    Warmed from the database on first use and updated immediately for
+    tokens blacklisted in this process. Other processes are caught up at
+    most once every ``sync_interval`` seconds by re-reading the rows
+    blacklisted since the previous sync minus ``sync_overlap`` seconds.
+    Ids and ``blacklisted_at`` are assigned before commit, so a row can
+    become visible after rows with later values; the overlap covers such
+    late commits and every ``full_sync_every``-th sync reloads the whole
+    set to bound anything slower. Checks in between cost no queries.
+    """
+
+    def __init__(self, sync_interval, sync_overlap=60.0, full_sync_every=30):
+        self.sync_interval = sync_interval
+        self.sync_overlap = timedelta(seconds=sync_overlap)
+        self.full_sync_every = max(1, full_sync_every)
+        self._entries = {}
+        self._synced_since = None
+        self._syncs = 0
+        self._synced_at = 0.0
+        self._lock = threading.Lock()
+
+    def contains(self, jti):
+        if self._synced_since is None or time.monotonic() - self._synced_at >= self.sync_interval:
+            self.sync()
+        return jti in self._entries
+
+    def add(self, jti, expires_at):
+        with self._lock:
+            self._entries[jti] = expires_at
+
+    def sync(self):
+        now = timezone.now()
+        full = self._synced_since is None or self._syncs % self.full_sync_every == 0
+        rows = BlacklistedToken.objects.filter(token__expires_at__gt=now)
+        if not full:
+            rows = rows.filter(blacklisted_at__gte=self._synced_since - self.sync_overlap)
+        rows = list(rows.values_list("token__jti", "token__expires_at"))
+
+        with self._lock:
+            entries = {
+                jti: expires_at for jti, expires_at in self._entries.items() if expires_at > now
+            }
+            entries.update(rows)
+            self._entries = entries
+            self._synced_since = now
+            self._syncs += 1
+            self._synced_at = time.monotonic()
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+            self._synced_since = None
+            self._syncs = 0
+
+
+blacklist_filter = BlacklistFilter(
+    sync_interval=getattr(settings, "TOKEN_BLACKLIST_SYNC_INTERVAL", 2.0),
+    sync_overlap=getattr(settings, "TOKEN_BLACKLIST_SYNC_OVERLAP", 60.0),
+    full_sync_every=getattr(settings, "TOKEN_BLACKLIST_FULL_SYNC_EVERY", 30),
+)
+
+
+def purge_expired_tokens(batch_size):
+    """
+    Delete expired outstanding tokens and their blacklist entries in
+    batches of ``batch_size``, one transaction each. Expired tokens fail
+    signature validation anyway, so their rows are dead weight.
+
+    Returns ``(outstanding_deleted, blacklisted_deleted)``.
+    """
+    outstanding_deleted = blacklisted_deleted = 0
+    cutoff = timezone.now()
+
+    while True:
+        ids = list(
+            OutstandingToken.objects.filter(expires_at__lte=cutoff)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            break
+        with transaction.atomic():
+            blacklisted_deleted += BlacklistedToken.objects.filter(token_id__in=ids).delete()[0]
+            outstanding_deleted += OutstandingToken.objects.filter(id__in=ids).delete()[0]
+
+    return outstanding_deleted, blacklisted_deleted
@@ -0,0 +1,68 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.authentication.authentication import CachedJWTAuthentication, user_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare queries and time per authenticated request between the plain "
+        "and the cached JWT authentication."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            help="Email or id of the user to authenticate as (default: first active user).",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=1000,
+            help="Number of requests to authenticate per mode (default: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        user = self.get_user(options["user"])
+        header = f"Bearer {AccessToken.for_user(user)}"
+        count = max(1, options["requests"])
+        user_cache.clear()
+
+        for label, authentication in [
+            ("JWTAuthentication", JWTAuthentication()),
+            ("CachedJWTAuthentication", CachedJWTAuthentication()),
+        ]:
+            queries, elapsed = self.run(authentication, header, count)
+            self.stdout.write(
+                f"{label:<24} {queries / count:6.3f} queries/request  "
+                f"{elapsed * 1_000_000 / count:8.1f} us/request  ({count} requests)"
+            )
+
+    def run(self, authentication, header, count):
+        factory = APIRequestFactory()
+        with CaptureQueriesContext(connection) as context:
+            started_at = time.perf_counter()
+            for _ in range(count):
+                request = factory.get("/api/employees/employees/", HTTP_AUTHORIZATION=header)
+                authentication.authenticate(request)
+            elapsed = time.perf_counter() - started_at
+        return len(context), elapsed
+
+    def get_user(self, value):
+        users = get_user_model().objects.filter(is_active=True).order_by("id")
+        if value is None:
+            user = users.first()
+        elif value.isdigit():
+            user = users.filter(id=int(value)).first()
+        else:
+            user = users.filter(email=value).first()
+        if user is None:
+            raise CommandError("No matching active user found.")
+        return user
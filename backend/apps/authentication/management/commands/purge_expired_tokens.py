@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.authentication.blacklist import purge_expired_tokens
+
+
+class Command(BaseCommand):
+    help = "Delete expired outstanding and blacklisted JWT refresh tokens in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of outstanding tokens deleted per transaction (default: 1000).",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep purging periodically instead of exiting.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=3600.0,
+            help="Seconds to wait between purges with --loop (default: 3600).",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            outstanding, blacklisted = purge_expired_tokens(max(1, options["batch_size"]))
+            self.stdout.write(self.style.SUCCESS(
+                f"Deleted {outstanding} expired outstanding tokens "
+                f"and {blacklisted} blacklist entries"
+            ))
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
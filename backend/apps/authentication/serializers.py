@@ -1,8 +1,11 @@
 from django.contrib.auth import get_user_model
 from djoser.serializers import UserCreateSerializer, UserSerializer
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 from drf_spectacular.utils import extend_schema_serializer, OpenApiExample
 
+from .tokens import FilteredRefreshToken
+
 User = get_user_model()
 
 
@@ -77,3 +80,10 @@ class CustomUserSerializer(UserSerializer):
             "date_joined",
             "is_active",
         )
+
+
+class FilteredTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Token refresh serializer that checks the blacklist in memory.
+    """
+    token_class = FilteredRefreshToken
@@ -1,3 +1,189 @@
+from datetime import timedelta
+from unittest import mock
+from uuid import uuid4
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from .authentication import user_cache
+from .blacklist import BlacklistFilter, purge_expired_tokens
+from .models import CustomUser
+
+
+class BlacklistFilterTests(TestCase):
+    """
+    A refresh token blacklisted by one process must be rejected by every
+    other process within ``sync_interval``, whatever order rows commit in.
+    """
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            username="owner", email="owner@example.com", password="password"
+        )
+        self.clock = 1000.0
+        patcher = mock.patch(
+            "apps.authentication.blacklist.time.monotonic", side_effect=lambda: self.clock
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def blacklist(self, blacklisted_at=None):
+        token = RefreshToken.for_user(self.user)
+        token.blacklist()
+        if blacklisted_at is not None:
+            BlacklistedToken.objects.filter(token__jti=token["jti"]).update(
+                blacklisted_at=blacklisted_at
+            )
+        return token["jti"]
+
+    def test_blacklist_from_another_process_is_seen_after_sync_interval(self):
+        other_process = BlacklistFilter(sync_interval=2.0)
+        self.assertFalse(other_process.contains("unknown"))
+
+        jti = self.blacklist()
+        self.assertFalse(other_process.contains(jti))
+
+        self.clock += 2.0
+        self.assertTrue(other_process.contains(jti))
+
+    def test_late_commit_within_overlap_is_seen(self):
+        other_process = BlacklistFilter(sync_interval=2.0, sync_overlap=60.0)
+        self.blacklist()
+        other_process.contains("unknown")
+
+        # A transaction that started before the last sync and committed after it.
+        jti = self.blacklist(blacklisted_at=timezone.now() - timedelta(seconds=30))
+        self.clock += 2.0
+        self.assertTrue(other_process.contains(jti))
+
+    def test_full_reload_catches_commits_older_than_overlap(self):
+        other_process = BlacklistFilter(sync_interval=2.0, sync_overlap=60.0, full_sync_every=2)
+        other_process.contains("unknown")
+
+        jti = self.blacklist(blacklisted_at=timezone.now() - timedelta(hours=2))
+        self.clock += 2.0
+        self.assertFalse(other_process.contains(jti))
+        self.clock += 2.0
+        self.assertTrue(other_process.contains(jti))
+
+    def test_logged_out_refresh_token_is_rejected(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        refresh = str(RefreshToken.for_user(self.user))
+
+        response = client.post("/api/user/logout/", {"refresh": refresh}, format="json")
+        self.assertEqual(response.status_code, 200)
+        response = client.post("/api/auth/jwt/refresh/", {"refresh": refresh}, format="json")
+        self.assertEqual(response.status_code, 401)
+
+
+class PurgeExpiredTokensTests(TestCase):
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            username="owner", email="owner@example.com", password="password"
+        )
+
+    def create_tokens(self, count, expires_at, blacklisted=False):
+        for _ in range(count):
+            token = OutstandingToken.objects.create(
+                user=self.user,
+                jti=uuid4().hex,
+                token="token",
+                expires_at=expires_at,
+            )
+            if blacklisted:
+                BlacklistedToken.objects.create(token=token)
+
+    def test_deletes_only_expired_tokens_in_batches(self):
+        now = timezone.now()
+        self.create_tokens(3, now - timedelta(days=1))
+        self.create_tokens(2, now - timedelta(days=1), blacklisted=True)
+        self.create_tokens(2, now + timedelta(days=1), blacklisted=True)
+
+        with CaptureQueriesContext(connection) as context:
+            result = purge_expired_tokens(batch_size=2)
+
+        self.assertEqual(result, (5, 2))
+        outstanding_deletes = [
+            query for query in context.captured_queries
+            if query["sql"].startswith('DELETE FROM "token_blacklist_outstandingtoken"')
+        ]
+        self.assertEqual(len(outstanding_deletes), 3)
+        self.assertEqual(OutstandingToken.objects.count(), 2)
+        self.assertEqual(BlacklistedToken.objects.count(), 2)
+        self.assertFalse(OutstandingToken.objects.filter(expires_at__lte=now).exists())
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    """
+    Repeated requests reuse the cached user; saving the user drops it at
+    once in this process, and other processes stop serving it after the TTL.
+    """
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            username="owner", email="owner@example.com", password="password"
+        )
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+        self.clock = 1000.0
+        patcher = mock.patch(
+            "apps.authentication.authentication.time.monotonic", side_effect=lambda: self.clock
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        user_cache.clear()
+        self.addCleanup(user_cache.clear)
+
+    def get_me(self):
+        return self.client.get("/api/auth/users/me/")
+
+    def user_selects(self, context):
+        return [
+            query for query in context.captured_queries
+            if query["sql"].startswith('SELECT "authentication_customuser"')
+        ]
+
+    def test_cached_user_skips_the_user_query(self):
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(self.get_me().status_code, 200)
+        self.assertEqual(len(self.user_selects(context)), 1)
+
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(self.get_me().status_code, 200)
+        self.assertEqual(self.user_selects(context), [])
+
+    def test_deactivated_user_is_rejected_immediately(self):
+        self.get_me()
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.get_me().status_code, 401)
+
+    def test_password_change_drops_the_cached_user(self):
+        self.get_me()
+        response = self.client.post(
+            "/api/auth/users/set_password/",
+            {"current_password": "password", "new_password": "a-new-Passw0rd!"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 204, response.content)
+        self.assertIsNone(user_cache.get(self.user.pk))
+
+        with CaptureQueriesContext(connection) as context:
+            self.get_me()
+        self.assertEqual(len(self.user_selects(context)), 1)
+
+    def test_deactivation_in_another_process_applies_after_ttl(self):
+        self.get_me()
+        # A queryset update sends no signal, like a write from another process.
+        CustomUser.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.get_me().status_code, 200)
 
-# Create your tests here.
+        self.clock += user_cache.ttl
+        self.assertEqual(self.get_me().status_code, 401)
@@ -0,0 +1,17 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .blacklist import blacklist_filter
+
+
+class FilteredRefreshToken(RefreshToken):
+    """
+    RefreshToken whose blacklist check is answered by ``blacklist_filter``
+    instead of a query per refresh.
+    """
+
+    def check_blacklist(self):
+        if blacklist_filter.contains(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
@@ -1,8 +1,9 @@
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.response import Response
 from rest_framework import status
+from .authentication import user_cache
+from .tokens import FilteredRefreshToken
 
 
 @api_view(["POST"])
@@ -16,8 +17,9 @@ def logout(request):
         refresh_token = request.data.get("refresh")
         if refresh_token:
             # Blacklist the token
-            token = RefreshToken(refresh_token)
+            token = FilteredRefreshToken(refresh_token)
             token.blacklist()
+            user_cache.invalidate(request.user.pk)
             return Response({"detail": "Logout successful."}, status=status.HTTP_200_OK)
         else:
             return Response(
@@ -0,0 +1,141 @@
+import math
+import re
+
+from django.db.models import Avg, Count, FloatField, IntegerField, Max, Min, Value
+from django.db.models.functions import Cast, Floor, Least, Substr
+
+from .expressions import NUMBER_PATTERN, DataValue
+
+
+DATE_BUCKETS = {"day": 10, "month": 7, "year": 4}
+DEFAULT_HISTOGRAM_BUCKETS = 10
+MAX_HISTOGRAM_BUCKETS = 100
+
+
+def filled(queryset, field):
+    """
+    Employees of ``queryset`` with a non-blank value for ``field``, with the
+    typed value available as ``value``. Keep in step with ``is_filled``,
+    which the incremental counters use.
+    """
+    return queryset.alias(
+        raw=DataValue(field.id, "TEXT"),
+    ).filter(
+        raw__isnull=False,
+    ).exclude(
+        raw="",
+    ).annotate(
+        value=DataValue(field.id, field.field_type),
+    ).filter(
+        # Non-numeric text in a NUMBER field has no typed value.
+        value__isnull=False,
+    )
+
+
+def is_filled(field_type, value):
+    """
+    Whether one stored ``value`` counts as filled for a field of
+    ``field_type``; the Python side of ``filled()``.
+    """
+    if value is None or value == "":
+        return False
+    if field_type != "NUMBER":
+        return True
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, (int, float)):
+        return math.isfinite(value)
+    return isinstance(value, str) and re.fullmatch(NUMBER_PATTERN, value) is not None
+
+
+def select_stats(queryset, field):
+    rows = (
+        queryset.values("value").annotate(count=Count("id")).order_by("-count", "value")
+    )
+    counts = {row["value"]: row["count"] for row in rows}
+    options = [
+        {"option": option, "count": counts.pop(option, 0)}
+        for option in field.options or []
+    ]
+    return {
+        "options": options,
+        "other": [{"option": value, "count": count} for value, count in counts.items()],
+    }
+
+
+def number_stats(queryset, field, buckets):
+    summary = queryset.aggregate(min=Min("value"), max=Max("value"), avg=Avg("value"))
+    low, high = summary["min"], summary["max"]
+    histogram = []
+
+    if low is not None:
+        width = (high - low) / buckets if high > low else 1.0
+        rows = (
+            queryset.annotate(
+                bucket=Least(
+                    Cast(Floor((Cast("value", FloatField()) - low) / width), IntegerField()),
+                    Value(buckets - 1),
+                )
+            )
+            .values("bucket")
+            .annotate(count=Count("id"))
+            .order_by("bucket")
+        )
+        counts = {row["bucket"]: row["count"] for row in rows}
+        histogram = [
+            {
+                "start": low + index * width,
+                "end": low + (index + 1) * width,
+                "count": counts.get(index, 0),
+            }
+            for index in range(buckets if high > low else 1)
+        ]
+
+    return {**summary, "histogram": histogram}
+
+
+def date_stats(queryset, field, bucket):
+    summary = queryset.aggregate(min=Min("value"), max=Max("value"))
+    rows = (
+        queryset.annotate(bucket=Substr("value", 1, DATE_BUCKETS[bucket]))
+        .values("bucket")
+        .annotate(count=Count("id"))
+        .order_by("bucket")
+    )
+    return {
+        **summary,
+        "bucket": bucket,
+        "counts": [{"bucket": row["bucket"], "count": row["count"]} for row in rows],
+    }
+
+
+def template_analytics(queryset, fields, histogram_buckets, date_bucket):
+    """
+    Per-field statistics for the employees in ``queryset``, computed in SQL.
+
+    Every statistic is a ``GROUP BY`` or aggregate over values extracted
+    from ``data``, so the response size depends on the number of buckets,
+    not on the number of employees.
+    """
+    total = queryset.count()
+    results = []
+
+    for field in fields:
+        values = filled(queryset, field)
+        filled_count = values.count()
+        stats = {
+            "id": field.id,
+            "label": field.label,
+            "field_type": field.field_type,
+            "filled": filled_count,
+            "missing": total - filled_count,
+        }
+        if field.field_type == "SELECT":
+            stats.update(select_stats(values, field))
+        elif field.field_type == "NUMBER":
+            stats.update(number_stats(values, field, histogram_buckets))
+        elif field.field_type == "DATE":
+            stats.update(date_stats(values, field, date_bucket))
+        results.append(stats)
+
+    return {"total": total, "fields": results}
@@ -0,0 +1,255 @@
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from apps.forms.models import FormTemplate
+from apps.forms.validation import get_template_validator
+from .counters import CounterChanges, record_rows
+from .models import Employee
+
+
+def get_chunk_size(value=None):
+    default = getattr(settings, "EMPLOYEE_BULK_CHUNK_SIZE", 500)
+    try:
+        chunk_size = int(value) if value is not None else default
+    except (TypeError, ValueError):
+        chunk_size = default
+    return max(1, min(chunk_size, getattr(settings, "EMPLOYEE_BULK_MAX_ROWS", 5000)))
+
+
+def parse_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def load_templates(template_ids, user):
+    """
+    Fetch the requested templates owned by ``user`` in a single query.
+    """
+    return {
+        template.id: template
+        for template in FormTemplate.objects.filter(
+            id__in=set(template_ids), created_by=user
+        )
+    }
+
+
+def build_employees(rows, user, templates=None):
+    """
+    Validate ``rows`` of ``{form_template, data}`` and build unsaved employees.
+
+    Each distinct template is resolved and compiled once for the whole batch.
+    Returns ``(employees, errors)`` where ``errors`` is a list of
+    ``{"index": ..., "errors": {...}}`` entries for the rejected rows.
+    """
+    if templates is None:
+        template_ids = [
+            parse_id(row.get("form_template")) for row in rows if isinstance(row, dict)
+        ]
+        templates = load_templates(template_ids, user)
+
+    employees = []
+    errors = []
+
+    for index, row in enumerate(rows):
+        if not isinstance(row, dict):
+            errors.append({"index": index, "errors": {"non_field_errors": ["Each item must be an object"]}})
+            continue
+
+        template = templates.get(parse_id(row.get("form_template")))
+        if template is None:
+            errors.append({"index": index, "errors": {"form_template": ["Form template not found"]}})
+            continue
+
+        data = row.get("data", {})
+        if not isinstance(data, dict):
+            errors.append({"index": index, "errors": {"data": ["Data must be a dictionary"]}})
+            continue
+
+        try:
+            # Parsed like the single-create serializer, so "false" and 0 are inactive.
+            is_active = serializers.BooleanField().to_internal_value(row.get("is_active", True))
+        except serializers.ValidationError as exc:
+            errors.append({"index": index, "errors": {"is_active": exc.detail}})
+            continue
+
+        validator = get_template_validator(template)
+        validation_errors = validator.validate(data)
+        if validation_errors:
+            errors.append({"index": index, "errors": {"data": validation_errors}})
+            continue
+
+        employee = Employee(
+            form_template=template,
+            data=data,
+            schema_version_id=validator.version,
+            created_by=user,
+            is_active=is_active,
+        )
+        employee.display_name = employee.compute_display_name()
+        employees.append(employee)
+
+    return employees, errors
+
+
+def insert_employees(employees, chunk_size):
+    """
+    Insert ``employees`` with ``bulk_create`` in chunks inside one transaction,
+    along with the template counters.
+    """
+    created = []
+    with transaction.atomic():
+        for start in range(0, len(employees), chunk_size):
+            created.extend(
+                Employee.objects.bulk_create(employees[start:start + chunk_size])
+            )
+        record_rows(
+            (employee.form_template_id, employee.is_active, employee.data)
+            for employee in created
+        )
+    return created
+
+
+def delete_employees(queryset):
+    """
+    Delete the employees in ``queryset`` and their counter contributions in
+    one transaction. Returns the number of employees deleted.
+    """
+    with transaction.atomic():
+        rows = list(queryset.values_list("form_template_id", "is_active", "data"))
+        deleted = queryset.delete()[1].get(Employee._meta.label, 0)
+        record_rows(rows, sign=-1)
+    return deleted
+
+
+UPDATE_FIELDS = ["data", "display_name", "schema_version", "is_active", "updated_at"]
+
+
+def apply_changes(employee, changes, now):
+    """
+    Merge partial ``changes`` (``data`` keys and/or ``is_active``) into ``employee``.
+
+    ``None`` values remove a key from ``data``. The merged record is validated
+    with the template's compiled validator. Returns ``(changed, errors)``.
+    """
+    data_changes = changes.get("data") or {}
+    if not isinstance(data_changes, dict):
+        return False, {"data": ["Data must be a dictionary"]}
+
+    is_active = employee.is_active
+    if "is_active" in changes:
+        try:
+            is_active = serializers.BooleanField().to_internal_value(changes["is_active"])
+        except serializers.ValidationError as exc:
+            return False, {"is_active": exc.detail}
+
+    data = dict(employee.data or {})
+    for key, value in data_changes.items():
+        if value is None:
+            data.pop(str(key), None)
+        else:
+            data[str(key)] = value
+
+    if data == employee.data and is_active == employee.is_active:
+        return False, None
+
+    validator = get_template_validator(employee.form_template)
+    validation_errors = validator.validate(data)
+    if validation_errors:
+        return False, {"data": validation_errors}
+
+    employee.data = data
+    employee.schema_version_id = validator.version
+    employee.is_active = is_active
+    employee.display_name = employee.compute_display_name()
+    employee.updated_at = now
+    return True, None
+
+
+def update_employees(queryset, changes_for, chunk_size):
+    """
+    Apply per-employee changes to ``queryset`` with ``bulk_update`` in chunks.
+
+    ``changes_for(employee)`` returns the partial changes for one employee.
+    Ids are read up front and employees loaded one chunk at a time, and all
+    chunks are written inside a single transaction.
+    """
+    now = timezone.now()
+    summary = {"matched_count": 0, "updated_count": 0, "unchanged_count": 0, "error_count": 0}
+    results = []
+    ids = list(queryset.order_by("id").values_list("id", flat=True))
+    counters = CounterChanges()
+
+    with transaction.atomic():
+        for start in range(0, len(ids), chunk_size):
+            employees = Employee.objects.filter(
+                id__in=ids[start:start + chunk_size]
+            ).select_related("form_template").order_by("id")
+
+            changed = []
+            for employee in employees:
+                summary["matched_count"] += 1
+                before = (employee.is_active, employee.data)
+                is_changed, errors = apply_changes(employee, changes_for(employee), now)
+                if errors:
+                    summary["error_count"] += 1
+                    results.append({"id": employee.id, "status": "error", "errors": errors})
+                elif is_changed:
+                    changed.append(employee)
+                    counters.change(
+                        employee.form_template_id, before, (employee.is_active, employee.data)
+                    )
+                    results.append({"id": employee.id, "status": "updated"})
+                else:
+                    summary["unchanged_count"] += 1
+                    results.append({"id": employee.id, "status": "unchanged"})
+
+            if changed:
+                summary["updated_count"] += Employee.objects.bulk_update(changed, UPDATE_FIELDS)
+
+        counters.apply()
+
+    return summary, results
+
+
+def throughput(row_count, started_at):
+    elapsed = time.perf_counter() - started_at
+    return {
+        "elapsed_ms": round(elapsed * 1000, 2),
+        "rows_per_second": round(row_count / elapsed, 2) if elapsed > 0 else None,
+    }
+
+
+def refresh_display_names(queryset, batch_size):
+    """
+    Recompute the stored display name for every employee in ``queryset``.
+
+    Rows are read and written in batches so the whole table is never held in
+    memory; only rows whose name actually changed are written back, with
+    ``updated_at`` bumped like any other write.
+    """
+    updated = 0
+    batch = []
+    employees = (
+        queryset.select_related("form_template")
+        .only("id", "data", "display_name", "form_template")
+        .order_by("id")
+        .iterator(chunk_size=batch_size)
+    )
+    for employee in employees:
+        display_name = employee.compute_display_name()
+        if display_name != employee.display_name:
+            employee.display_name = display_name
+            employee.updated_at = timezone.now()
+            batch.append(employee)
+        if len(batch) >= batch_size:
+            updated += Employee.objects.bulk_update(batch, ["display_name", "updated_at"])
+            batch = []
+    if batch:
+        updated += Employee.objects.bulk_update(batch, ["display_name", "updated_at"])
+    return updated
@@ -0,0 +1,135 @@
+from collections import Counter, defaultdict
+
+from django.db.models import Case, Count, F, IntegerField, Q, Value, When
+from django.utils import timezone
+
+from apps.forms.models import FormField, FormTemplate
+from .analytics import filled, is_filled
+
+
+class CounterChanges:
+    """
+    Accumulates employee counter deltas and writes them with one UPDATE per
+    table, so a bulk operation costs the same as a single-row one.
+
+    Whether a value counts as filled depends on the field type (``is_filled``),
+    which the field UPDATE resolves in SQL rather than with another query.
+
+    Must be applied inside the transaction that changes the employees.
+    """
+
+    def __init__(self):
+        self.templates = defaultdict(lambda: [0, 0])
+        self.fields = Counter()
+        self.number_fields = Counter()
+
+    def add(self, template_id, is_active, data, sign=1):
+        totals = self.templates[template_id]
+        totals[0] += sign
+        totals[1] += sign if is_active else 0
+        if not isinstance(data, dict):
+            return
+        for key, value in data.items():
+            key = str(key)
+            if key.isdigit() and is_filled("TEXT", value):
+                self.fields[(template_id, int(key))] += sign
+                if is_filled("NUMBER", value):
+                    self.number_fields[(template_id, int(key))] += sign
+
+    def remove(self, template_id, is_active, data):
+        self.add(template_id, is_active, data, sign=-1)
+
+    def change(self, template_id, before, after):
+        """
+        Record an update from ``before`` to ``after`` ``(is_active, data)``.
+        """
+        self.remove(template_id, *before)
+        self.add(template_id, *after)
+
+    def apply(self):
+        templates = {
+            template_id: totals
+            for template_id, totals in self.templates.items() if any(totals)
+        }
+        fields = {
+            key for key in self.fields.keys() | self.number_fields.keys()
+            if self.fields[key] or self.number_fields[key]
+        }
+
+        if templates:
+            FormTemplate.objects.filter(pk__in=templates).update(
+                employee_count=F("employee_count") + _deltas(
+                    (Q(pk=template_id), totals[0]) for template_id, totals in templates.items()
+                ),
+                active_employee_count=F("active_employee_count") + _deltas(
+                    (Q(pk=template_id), totals[1]) for template_id, totals in templates.items()
+                ),
+                counters_updated_at=timezone.now(),
+            )
+        if fields:
+            conditions = []
+            for template_id, field_id in fields:
+                condition = Q(pk=field_id, form_template_id=template_id)
+                conditions.append((
+                    condition & Q(field_type="NUMBER"),
+                    self.number_fields[(template_id, field_id)],
+                ))
+                conditions.append((condition, self.fields[(template_id, field_id)]))
+            FormField.objects.filter(pk__in={field_id for _, field_id in fields}).update(
+                filled_count=F("filled_count") + _deltas(conditions),
+            )
+            if not templates:
+                FormTemplate.objects.filter(
+                    pk__in={template_id for template_id, _ in fields}
+                ).update(counters_updated_at=timezone.now())
+
+        self.templates.clear()
+        self.fields.clear()
+        self.number_fields.clear()
+
+
+def _deltas(conditions):
+    # The first matching condition wins, so zero deltas are kept.
+    return Case(
+        *(When(condition, then=Value(delta)) for condition, delta in conditions),
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def record_rows(rows, sign=1):
+    """
+    Apply counters for ``(form_template_id, is_active, data)`` rows.
+    """
+    changes = CounterChanges()
+    for template_id, is_active, data in rows:
+        changes.add(template_id, is_active, data, sign)
+    changes.apply()
+
+
+def reconcile_template(template, employees):
+    """
+    Recompute ``template``'s counters from ``employees`` with SQL aggregates.
+
+    Returns True if any stored counter had drifted.
+    """
+    queryset = employees.filter(form_template=template)
+    totals = queryset.aggregate(
+        employee_count=Count("id"),
+        active_employee_count=Count("id", filter=Q(is_active=True)),
+    )
+    drifted = (
+        totals["employee_count"] != template.employee_count
+        or totals["active_employee_count"] != template.active_employee_count
+    )
+    FormTemplate.objects.filter(pk=template.pk).update(
+        counters_updated_at=timezone.now(), **totals
+    )
+
+    for field in template.fields.all():
+        filled_count = filled(queryset, field).count()
+        if filled_count != field.filled_count:
+            drifted = True
+            FormField.objects.filter(pk=field.pk).update(filled_count=filled_count)
+
+    return drifted
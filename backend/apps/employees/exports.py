@@ -0,0 +1,127 @@
+import csv
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+EXPORT_COLUMNS = ("id", "data", "is_active", "created_at", "updated_at")
+
+
+class Echo:
+    """
+    File-like object whose ``write`` hands the line back to the caller,
+    so ``csv.writer`` can be used without buffering the whole export.
+    """
+
+    def write(self, value):
+        return value
+
+
+def get_export_chunk_size():
+    return getattr(settings, "EMPLOYEE_EXPORT_CHUNK_SIZE", 2000)
+
+
+def export_rows(queryset):
+    return (
+        queryset.order_by("id")
+        .values_list(*EXPORT_COLUMNS)
+        .iterator(chunk_size=get_export_chunk_size())
+    )
+
+
+async def aexport_rows(queryset):
+    # One keyset-paginated query per chunk, so no cursor is held open
+    # between awaits.
+    chunk_size = get_export_chunk_size()
+    rows = queryset.order_by("id").values_list(*EXPORT_COLUMNS)
+    last_id = None
+    while True:
+        chunk = rows if last_id is None else rows.filter(id__gt=last_id)
+        chunk = [row async for row in chunk[:chunk_size]]
+        for row in chunk:
+            yield row
+        if len(chunk) < chunk_size:
+            break
+        last_id = chunk[-1][0]
+
+
+def iter_csv(fields, queryset):
+    """
+    Yield CSV lines with one column per form field, ordered by ``FormField.order``.
+    """
+    writer = csv.writer(Echo())
+    keys = [str(field.id) for field in fields]
+
+    yield _csv_header(writer, fields)
+    for row in export_rows(queryset):
+        yield _csv_line(writer, keys, row)
+
+
+async def aiter_csv(fields, queryset):
+    """
+    ``iter_csv`` as an async iterator, so ASGI servers stream it instead of
+    collecting it in memory.
+    """
+    writer = csv.writer(Echo())
+    keys = [str(field.id) for field in fields]
+
+    yield _csv_header(writer, fields)
+    async for row in aexport_rows(queryset):
+        yield _csv_line(writer, keys, row)
+
+
+def iter_ndjson(queryset):
+    """
+    Yield one JSON document per employee, separated by newlines.
+    """
+    for row in export_rows(queryset):
+        yield _ndjson_line(row)
+
+
+async def aiter_ndjson(queryset):
+    async for row in aexport_rows(queryset):
+        yield _ndjson_line(row)
+
+
+def _csv_header(writer, fields):
+    return writer.writerow(
+        ["ID"] + [field.label for field in fields] + ["Active", "Created At", "Updated At"]
+    )
+
+
+def _csv_line(writer, keys, row):
+    employee_id, data, is_active, created_at, updated_at = row
+    data = data or {}
+    return writer.writerow(
+        [employee_id]
+        + [_csv_value(data.get(key)) for key in keys]
+        + [is_active, created_at.isoformat(), updated_at.isoformat()]
+    )
+
+
+def _ndjson_line(row):
+    employee_id, data, is_active, created_at, updated_at = row
+    return json.dumps(
+        {
+            "id": employee_id,
+            "data": data,
+            "is_active": is_active,
+            "created_at": created_at,
+            "updated_at": updated_at,
+        },
+        cls=DjangoJSONEncoder,
+    ) + "\n"
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return value
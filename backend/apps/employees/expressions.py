@@ -0,0 +1,217 @@
+import json
+import math
+
+from django.db import NotSupportedError
+from django.db.models import F, FloatField, Func, Index, JSONField, Q, TextField
+
+
+SUPPORTED_VENDORS = ("sqlite", "postgresql", "mysql")
+# Text holding a JSON number; anything else in a NUMBER field reads as NULL.
+NUMBER_PATTERN = r"^ *-?(0|[1-9][0-9]*)(\.[0-9]+)?([eE][-+]?[0-9]+)? *$"
+# IMMUTABLE SQL function created by migration 0010 on PostgreSQL.
+DATA_TEXT_FUNCTION = "employee_data_text"
+
+
+def supports_data_keys(connection):
+    return connection.vendor in SUPPORTED_VENDORS
+
+
+def supports_containment(connection):
+    return connection.vendor == "postgresql"
+
+
+def data_contains(field_id, values):
+    """
+    Employees whose form field ``field_id`` reads as one of the strings in
+    ``values``, as JSONB containment (``data @> '{"12": "IT"}'``) so that
+    the ``jsonb_path_ops`` GIN index on ``data`` serves it. PostgreSQL only.
+
+    TEXT and SELECT values are not type-checked on write, so a value like
+    ``"123"`` also matches a stored number ``123`` (and ``"true"`` a stored
+    boolean), the same rows a ``data ->> 'id'`` text comparison matches.
+    """
+    condition = Q()
+    for value in values:
+        for stored in json_scalars(value):
+            condition |= Q(data__contains={str(field_id): stored})
+    return condition
+
+
+def json_scalars(value):
+    """
+    The JSON values whose text form (``->>``) is exactly ``value``.
+    """
+    scalars = [value]
+    try:
+        parsed = json.loads(value)
+    except ValueError:
+        return scalars
+    if (
+        isinstance(parsed, (bool, int, float))
+        and math.isfinite(parsed)
+        and json.dumps(parsed) == value
+    ):
+        scalars.append(parsed)
+    return scalars
+
+
+def json_key_path(key):
+    return "$." + json.dumps(str(key))
+
+
+class DataKey(Func):
+    """
+    The JSON value stored under ``key`` in a JSON column, as JSON.
+
+    Form field ids are numeric strings, which Django's ``KeyTransform``
+    treats as array indexes; this always addresses an object key.
+    """
+
+    output_field = JSONField()
+
+    def __init__(self, key, field_name="data"):
+        super().__init__(F(field_name))
+        self.key = str(key)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.key!r}, {self.source_expressions[0]!r})"
+
+    def as_sql(self, compiler, connection, **extra_context):
+        raise NotSupportedError(
+            f"Data key extraction is not supported on {connection.vendor}."
+        )
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        lhs, params = compiler.compile(self.source_expressions[0])
+        path = json_key_path(self.key)
+        sql = (
+            f"(CASE JSON_TYPE({lhs}, %s) "
+            f"WHEN 'text' THEN JSON_QUOTE(JSON_EXTRACT({lhs}, %s)) "
+            f"WHEN 'true' THEN 'true' WHEN 'false' THEN 'false' "
+            f"ELSE CAST(JSON_EXTRACT({lhs}, %s) AS TEXT) END)"
+        )
+        return sql, (*params, path, *params, path, *params, path)
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        lhs, params = compiler.compile(self.source_expressions[0])
+        return f"JSON_EXTRACT({lhs}, %s)", (*params, json_key_path(self.key))
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        lhs, params = compiler.compile(self.source_expressions[0])
+        return f"({lhs} -> %s)", (*params, self.key)
+
+
+class DataValue(Func):
+    """
+    The scalar value of a form field inside ``data``, typed by ``field_type``.
+
+    NUMBER values are cast to a number, everything else compares as text
+    (DATE values are ISO ``YYYY-MM-DD`` strings, so they sort correctly).
+    Text readings follow PostgreSQL's ``->>`` on every engine: a stored
+    number ``123`` reads as ``'123'`` and a boolean as ``'true'``.
+    Values that are not numbers (blank optional fields, text left over from
+    before a field became NUMBER) are NULL rather than a cast error or 0.
+    The JSON path is inlined rather than bound so that the generated SQL is
+    identical to the one in ``field_index`` and the planner can use it.
+    """
+
+    def __init__(self, field_id, field_type, field_name="data"):
+        self.field_id = int(field_id)
+        self.field_type = field_type
+        output_field = FloatField() if field_type == "NUMBER" else TextField()
+        super().__init__(F(field_name), output_field=output_field)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.field_id!r}, {self.field_type!r})"
+
+    @property
+    def is_numeric(self):
+        return self.field_type == "NUMBER"
+
+    def as_sql(self, compiler, connection, **extra_context):
+        raise NotSupportedError(
+            f"Data value extraction is not supported on {connection.vendor}."
+        )
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        lhs, params = compiler.compile(self.source_expressions[0])
+        path = json_key_path(self.field_id)
+        sql = f"JSON_EXTRACT({lhs}, '{path}')"
+        if self.is_numeric:
+            # A number, or text holding a JSON number (SQLite has no regex);
+            # the same grammar as NUMBER_PATTERN.
+            sql = (
+                f"(CASE WHEN JSON_TYPE({lhs}, '{path}') IN ('integer', 'real') THEN {sql} "
+                f"WHEN JSON_TYPE({lhs}, '{path}') = 'text' AND JSON_VALID(TRIM({sql})) THEN "
+                f"(CASE WHEN JSON_TYPE(TRIM({sql})) IN ('integer', 'real') "
+                f"THEN CAST(TRIM({sql}) AS REAL) END) END)"
+            )
+            params = params * 6
+        else:
+            sql = (
+                f"(CASE JSON_TYPE({lhs}, '{path}') WHEN 'true' THEN 'true' "
+                f"WHEN 'false' THEN 'false' ELSE CAST({sql} AS TEXT) END)"
+            )
+            params = params * 2
+        return sql, params
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        lhs, params = compiler.compile(self.source_expressions[0])
+        sql = f"JSON_UNQUOTE(JSON_EXTRACT({lhs}, '{json_key_path(self.field_id)}'))"
+        if self.is_numeric:
+            sql = f"CAST({sql} AS DOUBLE)"
+        return sql, params
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        lhs, params = compiler.compile(self.source_expressions[0])
+        sql = f"({lhs} ->> '{self.field_id}')"
+        if self.is_numeric:
+            sql = (
+                f"(CASE WHEN jsonb_typeof({lhs} -> '{self.field_id}') = 'number' "
+                f"OR {sql} ~ '{NUMBER_PATTERN}' THEN ({sql})::double precision END)"
+            )
+            params = params * 3
+        return sql, params
+
+
+class DataText(Func):
+    """
+    The top-level values of ``data`` joined by spaces, without the JSON keys,
+    for substring search. PostgreSQL only, where the expression is covered
+    by a trigram index.
+    """
+
+    output_field = TextField()
+
+    def __init__(self, field_name="data"):
+        super().__init__(F(field_name))
+
+    def as_sql(self, compiler, connection, **extra_context):
+        raise NotSupportedError(
+            f"Data text extraction is not supported on {connection.vendor}."
+        )
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        lhs, params = compiler.compile(self.source_expressions[0])
+        return f"{DATA_TEXT_FUNCTION}({lhs})", params
+
+
+FIELD_INDEX_PREFIX = "employee_field_"
+
+
+def field_index_name(field):
+    # The expression depends on the field type, so a type change renames the
+    # index and sync_field_indexes rebuilds it.
+    kind = "num" if field.field_type == "NUMBER" else "txt"
+    return f"{FIELD_INDEX_PREFIX}{field.id}_{kind}_idx"
+
+
+def field_index(field):
+    """
+    Partial expression index over one form field's values within its template.
+    """
+    return Index(
+        DataValue(field.id, field.field_type),
+        condition=Q(form_template_id=field.form_template_id),
+        name=field_index_name(field),
+    )
@@ -0,0 +1,142 @@
+import re
+from datetime import datetime
+
+from django.db import connections
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, SearchFilter
+
+from apps.forms.models import FormField
+from apps.forms.validation import DATE_FORMAT
+from .expressions import DataValue, data_contains, supports_containment
+from .search import search_employees
+
+
+def split_list(value):
+    """
+    Split a comma-separated query value; a backslash escapes the next
+    character, so ``R&D\\, Europe`` is one item.
+    """
+    items = []
+    item = []
+    chars = iter(value)
+    for char in chars:
+        if char == "\\":
+            item.append(next(chars, char))
+        elif char == ",":
+            items.append("".join(item))
+            item = []
+        else:
+            item.append(char)
+    items.append("".join(item))
+    return items
+
+
+class EmployeeSearchFilter(SearchFilter):
+    """
+    ``?search=`` filter backed by the employee search index instead of
+    ``icontains`` lookups over ``search_fields``.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, "").strip()
+        if not query:
+            return queryset
+        return search_employees(queryset, query, ordered=False)
+
+
+class EmployeeFieldFilter(BaseFilterBackend):
+    """
+    Typed filters on individual form-field values, e.g.
+    ``?field_12__gte=50000&field_15__in=IT,HR&field_18__lt=2024-01-01``.
+
+    Values are compared in SQL according to ``FormField.field_type``; range
+    operators are only available on NUMBER and DATE fields. On PostgreSQL,
+    exact and ``in`` matches on non-numeric fields use JSONB containment.
+
+    A single ``in`` parameter is split on commas, with ``\\,`` for a literal
+    comma; a repeated one (``?field_15__in=IT&field_15__in=HR``) is taken
+    one value per occurrence, unsplit.
+    """
+
+    param_pattern = re.compile(r"^field_(?P<field_id>\d+)(?:__(?P<op>[a-z]+))?$")
+    range_operators = ("gt", "gte", "lt", "lte")
+    operators = ("exact", "in") + range_operators
+    range_types = ("NUMBER", "DATE")
+
+    def filter_queryset(self, request, queryset, view):
+        params = []
+        for name, values in request.query_params.lists():
+            match = self.param_pattern.match(name)
+            if not match:
+                continue
+            op = match["op"] or "exact"
+            if op == "in":
+                # A repeated parameter carries one value per occurrence.
+                values = [values if len(values) > 1 else split_list(values[0])]
+            for value in values:
+                params.append((name, int(match["field_id"]), op, value))
+        if not params:
+            return queryset
+
+        fields = FormField.objects.filter(
+            id__in={field_id for _, field_id, _, _ in params},
+            form_template__created_by=request.user,
+        ).in_bulk()
+
+        errors = {}
+        for index, (name, field_id, op, value) in enumerate(params):
+            field = fields.get(field_id)
+            if field is None:
+                errors[name] = ["Unknown form field."]
+                continue
+            if op not in self.operators:
+                errors[name] = [f"Operator must be one of: {', '.join(self.operators)}"]
+                continue
+            if op in self.range_operators and field.field_type not in self.range_types:
+                errors[name] = [f"{field.label} does not support range filters."]
+                continue
+            try:
+                if op == "in":
+                    value = [self.parse_value(field, item) for item in value]
+                else:
+                    value = self.parse_value(field, value)
+            except ValueError as exc:
+                errors[name] = [str(exc)]
+                continue
+
+            if (
+                op in ("exact", "in")
+                and field.field_type != "NUMBER"
+                and supports_containment(connections[queryset.db])
+            ):
+                queryset = queryset.filter(
+                    data_contains(field.id, value if op == "in" else [value]),
+                    form_template_id=field.form_template_id,
+                )
+                continue
+
+            alias = f"field_value_{index}"
+            queryset = queryset.alias(
+                **{alias: DataValue(field.id, field.field_type)}
+            ).filter(
+                form_template_id=field.form_template_id,
+                **{f"{alias}__{op}": value},
+            )
+
+        if errors:
+            raise ValidationError(errors)
+        return queryset
+
+    def parse_value(self, field, value):
+        value = value.strip()
+        if field.field_type == "NUMBER":
+            try:
+                return float(value)
+            except ValueError:
+                raise ValueError(f"{field.label} must be a valid number")
+        if field.field_type == "DATE":
+            try:
+                datetime.strptime(value, DATE_FORMAT)
+            except ValueError:
+                raise ValueError(f"{field.label} must be a valid date (YYYY-MM-DD)")
+        return value
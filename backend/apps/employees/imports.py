@@ -0,0 +1,134 @@
+import csv
+import io
+import json
+import time
+
+from .bulk import build_employees, insert_employees, throughput
+
+
+IMPORT_FORMATS = ("csv", "ndjson")
+MAX_REPORTED_ERRORS = 1000
+
+
+def detect_format(upload, requested=None):
+    if requested:
+        return requested.lower()
+    name = (upload.name or "").lower()
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    return "csv"
+
+
+def build_column_map(fields):
+    """
+    Map normalised column names (field labels or ids) to data keys, once per import.
+    """
+    column_map = {}
+    for field in fields:
+        key = str(field.id)
+        column_map[field.label.strip().lower()] = key
+        column_map[key] = key
+    return column_map
+
+
+def iter_csv_records(stream, column_map, ignored):
+    reader = csv.reader(stream)
+    header = next(reader, None)
+    if header is None:
+        return
+
+    columns = []
+    for name in header:
+        key = column_map.get(name.strip().lower())
+        if key is None and name.strip():
+            ignored.add(name.strip())
+        columns.append(key)
+
+    for row in reader:
+        if not any(cell.strip() for cell in row):
+            continue
+        data = {
+            key: value for key, value in zip(columns, row)
+            if key is not None and value != ""
+        }
+        yield reader.line_num, data, None
+
+
+def iter_ndjson_records(stream, column_map, ignored):
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_number, None, "Invalid JSON"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, "Each line must be a JSON object"
+            continue
+
+        values = record.get("data") if isinstance(record.get("data"), dict) else record
+        data = {}
+        for name, value in values.items():
+            key = column_map.get(str(name).strip().lower())
+            if key is None:
+                ignored.add(str(name))
+                continue
+            data[key] = value
+        yield line_number, data, None
+
+
+def import_employees(upload, template, user, import_format, batch_size):
+    """
+    Stream ``upload`` into employees of ``template``.
+
+    Rows are validated in batches of ``batch_size`` and every batch is
+    committed in its own transaction, so a bad line only drops that line.
+    """
+    started_at = time.perf_counter()
+    column_map = build_column_map(template.fields.all())
+    templates = {template.id: template}
+    ignored = set()
+    stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+
+    if import_format == "ndjson":
+        records = iter_ndjson_records(stream, column_map, ignored)
+    else:
+        records = iter_csv_records(stream, column_map, ignored)
+
+    summary = {"total_rows": 0, "created_count": 0, "error_count": 0, "errors": []}
+
+    def report(line_number, errors):
+        summary["error_count"] += 1
+        if len(summary["errors"]) < MAX_REPORTED_ERRORS:
+            summary["errors"].append({"line": line_number, "errors": errors})
+
+    def flush(batch):
+        rows = [{"form_template": template.id, "data": data} for _, data in batch]
+        employees, errors = build_employees(rows, user, templates)
+        for error in errors:
+            report(batch[error["index"]][0], error["errors"])
+        summary["created_count"] += len(insert_employees(employees, batch_size))
+
+    batch = []
+    try:
+        for line_number, data, error in records:
+            summary["total_rows"] += 1
+            if error:
+                report(line_number, {"non_field_errors": [error]})
+                continue
+            batch.append((line_number, data))
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+    except (UnicodeDecodeError, csv.Error) as exc:
+        summary["error_count"] += 1
+        summary["errors"].append({"line": None, "errors": {"file": [str(exc)]}})
+    finally:
+        stream.detach()
+
+    summary["ignored_columns"] = sorted(ignored)
+    summary.update(throughput(summary["total_rows"], started_at))
+    return summary
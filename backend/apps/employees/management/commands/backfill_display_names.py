@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from apps.employees.bulk import refresh_display_names
+from apps.employees.models import Employee
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored display_name of employees in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--template",
+            type=int,
+            help="Only backfill employees of this form template id.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of employees read and written per batch (default: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        queryset = Employee.objects.all()
+        if options["template"]:
+            queryset = queryset.filter(form_template_id=options["template"])
+
+        updated = refresh_display_names(queryset, max(1, options["batch_size"]))
+        self.stdout.write(self.style.SUCCESS(f"Updated display_name for {updated} employees"))
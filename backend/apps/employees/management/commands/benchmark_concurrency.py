@@ -0,0 +1,117 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from django.urls import resolve
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+class Command(BaseCommand):
+    help = (
+        "Issue concurrent authenticated GET requests against a read endpoint "
+        "in-process and report throughput and latency. Views are served the "
+        "way the current settings build them: async (ASYNC_READ_VIEWS=True, "
+        "the ASGI profile) or sync on a thread pool (WSGI)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            help="Email or id of the user to authenticate as (default: first active user).",
+        )
+        parser.add_argument(
+            "--path",
+            default="/api/employees/employees/",
+            help="Path to request (default: /api/employees/employees/).",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=200,
+            help="Total number of requests (default: 200).",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=20,
+            help="Number of requests in flight at once (default: 20).",
+        )
+
+    def handle(self, *args, **options):
+        user = self.get_user(options["user"])
+        path = options["path"]
+        count = max(1, options["requests"])
+        concurrency = max(1, options["concurrency"])
+        headers = {"Authorization": f"Bearer {AccessToken.for_user(user)}"}
+
+        is_async = iscoroutinefunction(resolve(path.split("?")[0]).func)
+        if not is_async:
+            self.stdout.write(self.style.WARNING(
+                f"{path} is served by a sync view; run with ASYNC_READ_VIEWS=True "
+                "to benchmark the async read path."
+            ))
+
+        # The test clients send requests for the "testserver" host.
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            started_at = time.perf_counter()
+            if is_async:
+                results = asyncio.run(self.run_async(path, headers, count, concurrency))
+            else:
+                results = self.run_threaded(path, headers, count, concurrency)
+            elapsed = time.perf_counter() - started_at
+
+        latencies = sorted(latency for _, latency in results)
+        errors = sum(1 for status, _ in results if status >= 400)
+        self.stdout.write(
+            f"{'async' if is_async else 'threaded'}: {count} requests, "
+            f"concurrency {concurrency}, {errors} errors"
+        )
+        self.stdout.write(
+            f"{count / elapsed:8.1f} requests/s  "
+            f"p50 {statistics.median(latencies) * 1000:7.1f} ms  "
+            f"p95 {latencies[int((len(latencies) - 1) * 0.95)] * 1000:7.1f} ms"
+        )
+
+    def run_threaded(self, path, headers, count, concurrency):
+        def fetch(_):
+            try:
+                started_at = time.perf_counter()
+                response = Client().get(path, headers=headers)
+                return response.status_code, time.perf_counter() - started_at
+            finally:
+                close_old_connections()
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return list(executor.map(fetch, range(count)))
+
+    async def run_async(self, path, headers, count, concurrency):
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch():
+            async with semaphore:
+                started_at = time.perf_counter()
+                response = await client.get(path, headers=headers)
+                return response.status_code, time.perf_counter() - started_at
+
+        return await asyncio.gather(*(fetch() for _ in range(count)))
+
+    def get_user(self, value):
+        users = get_user_model().objects.filter(is_active=True).order_by("id")
+        if value is None:
+            user = users.first()
+        elif value.isdigit():
+            user = users.filter(id=int(value)).first()
+        else:
+            user = users.filter(email=value).first()
+        if user is None:
+            raise CommandError("No matching active user found.")
+        return user
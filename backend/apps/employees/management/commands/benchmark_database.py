@@ -0,0 +1,164 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+SCHEMA = """
+CREATE TABLE employee (
+    id INTEGER PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    display_name TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX employee_created_at ON employee (created_at);
+"""
+LIST_QUERY = "SELECT id, display_name, data FROM employee ORDER BY created_at DESC LIMIT 20"
+SEARCH_QUERY = "SELECT id, display_name, data FROM employee WHERE display_name LIKE ? LIMIT 20"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure list/search read latency while a writer commits bulk inserts, "
+        "with SQLite's default settings and with the production profile "
+        "(SQLITE_PRAGMAS). Runs against a throwaway database file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=20000,
+            help="Rows to seed before measuring (default: 20000).",
+        )
+        parser.add_argument(
+            "--readers",
+            type=int,
+            default=4,
+            help="Number of concurrent reader threads (default: 4).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=20000,
+            help="Rows inserted per write transaction (default: 20000).",
+        )
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=5.0,
+            help="Seconds to run each profile for (default: 5).",
+        )
+
+    def handle(self, *args, **options):
+        for label, pragmas in [
+            ("development", []),
+            ("production", settings.SQLITE_PRAGMAS),
+        ]:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "benchmark.sqlite3")
+                self.seed(path, pragmas, options["rows"])
+                reads, errors, writes = self.run(path, pragmas, options)
+
+            self.stdout.write(
+                f"{label:<12} {len(reads) / options['duration']:9.1f} reads/s  "
+                f"p50 {self.ms(self.percentile(reads, 0.5)):7.1f} ms  "
+                f"p99 {self.ms(self.percentile(reads, 0.99)):7.1f} ms  "
+                f"max {self.ms(max(reads, default=0)):8.1f} ms  "
+                f"{errors} lock errors  {writes} rows written"
+            )
+
+    def run(self, path, pragmas, options):
+        stop = threading.Event()
+        reads = []
+        errors = [0]
+        writes = [0]
+        lock = threading.Lock()
+
+        def read():
+            connection = self.connect(path, pragmas)
+            latencies = []
+            failures = 0
+            iteration = 0
+            while not stop.is_set():
+                started_at = time.perf_counter()
+                try:
+                    if iteration % 2:
+                        connection.execute(SEARCH_QUERY, (f"%{iteration % 100}%",)).fetchall()
+                    else:
+                        connection.execute(LIST_QUERY).fetchall()
+                    latencies.append(time.perf_counter() - started_at)
+                except sqlite3.OperationalError:
+                    failures += 1
+                iteration += 1
+            connection.close()
+            with lock:
+                reads.extend(latencies)
+                errors[0] += failures
+
+        def write():
+            connection = self.connect(path, pragmas)
+            offset = options["rows"]
+            while not stop.is_set():
+                try:
+                    with connection:
+                        connection.executemany(
+                            "INSERT INTO employee (created_at, display_name, data) VALUES (?, ?, ?)",
+                            self.rows(offset, options["batch_size"]),
+                        )
+                    offset += options["batch_size"]
+                except sqlite3.OperationalError:
+                    with lock:
+                        errors[0] += 1
+            connection.close()
+            writes[0] = offset - options["rows"]
+
+        threads = [threading.Thread(target=write)]
+        threads += [threading.Thread(target=read) for _ in range(max(1, options["readers"]))]
+        for thread in threads:
+            thread.start()
+        time.sleep(options["duration"])
+        stop.set()
+        for thread in threads:
+            thread.join()
+        return reads, errors[0], writes[0]
+
+    def seed(self, path, pragmas, count):
+        connection = self.connect(path, pragmas)
+        connection.executescript(SCHEMA)
+        with connection:
+            connection.executemany(
+                "INSERT INTO employee (created_at, display_name, data) VALUES (?, ?, ?)",
+                self.rows(0, count),
+            )
+        connection.close()
+
+    def connect(self, path, pragmas):
+        # Python's sqlite3 (like Django) waits up to 5 seconds on a locked database.
+        connection = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        for pragma in pragmas:
+            connection.execute(pragma)
+        return connection
+
+    def rows(self, offset, count):
+        for number in range(offset, offset + count):
+            name = f"Employee {number}"
+            yield (
+                f"2024-01-01T00:00:00.{number:09d}",
+                name,
+                json.dumps({"1": name, "2": f"employee{number}@example.com", "3": "IT"}),
+            )
+
+    def percentile(self, values, fraction):
+        if not values:
+            return 0
+        values = sorted(values)
+        return values[int((len(values) - 1) * fraction)]
+
+    def ms(self, seconds):
+        return seconds * 1000
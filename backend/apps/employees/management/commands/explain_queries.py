@@ -0,0 +1,86 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models.functions import Lower
+from rest_framework.test import APIRequestFactory
+
+from apps.employees.views import EmployeeViewSet
+from apps.forms.models import FormTemplate
+from apps.forms.views import FormFieldViewSet, FormTemplateViewSet
+
+
+class Command(BaseCommand):
+    help = (
+        "Print the query plan of each endpoint's main query, built through the "
+        "real viewsets, to confirm the per-user indexes are used."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            help="Email or id of the user to build the queries for (default: first user).",
+        )
+        parser.add_argument(
+            "--template",
+            type=int,
+            help="Form template id used for the per-template queries (default: user's latest).",
+        )
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="Refresh planner statistics with ANALYZE before explaining.",
+        )
+
+    def handle(self, *args, **options):
+        if options["analyze"]:
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+        user = self.get_user(options["user"])
+        template_id = options["template"] or (
+            FormTemplate.objects.filter(created_by=user).values_list("id", flat=True).first() or 0
+        )
+
+        endpoints = [
+            ("GET /employees/", EmployeeViewSet, "list", {}),
+            ("GET /employees/?is_active=true", EmployeeViewSet, "list", {"is_active": "true"}),
+            ("GET /employees/?form_template=<id>", EmployeeViewSet, "list", {"form_template": template_id}),
+            ("GET /employees/?ordering=-updated_at", EmployeeViewSet, "list", {"ordering": "-updated_at"}),
+            ("GET /form-templates/", FormTemplateViewSet, "list", {}),
+            ("GET /form-templates/?is_active=true", FormTemplateViewSet, "list", {"is_active": "true"}),
+            ("GET /form-fields/", FormFieldViewSet, "list", {}),
+        ]
+
+        for label, viewset, action, params in endpoints:
+            queryset = self.build_queryset(viewset, action, params, user)
+            self.print_plan(label, queryset[:20])
+
+        self.print_plan(
+            "FormTemplateSerializer.validate_name",
+            FormTemplate.objects.alias(name_lower=Lower("name")).filter(
+                created_by=user, name_lower="example"
+            ),
+        )
+
+    def get_user(self, value):
+        users = get_user_model().objects.order_by("id")
+        if value is None:
+            user = users.first()
+        elif value.isdigit():
+            user = users.filter(id=int(value)).first()
+        else:
+            user = users.filter(email=value).first()
+        if user is None:
+            raise CommandError("No matching user found.")
+        return user
+
+    def build_queryset(self, viewset, action, params, user):
+        view = viewset(action_map={"get": action}, format_kwarg=None, kwargs={}, args=())
+        view.request = view.initialize_request(APIRequestFactory().get("/", params))
+        view.request.user = user
+        return view.filter_queryset(view.get_queryset())
+
+    def print_plan(self, label, queryset):
+        self.stdout.write(self.style.MIGRATE_HEADING(label))
+        self.stdout.write(queryset.explain())
+        self.stdout.write("")
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.employees.purge import run_pending_purge_jobs
+
+
+class Command(BaseCommand):
+    help = "Run pending employee purge jobs created by soft bulk deletes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling for new jobs instead of exiting when idle.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Seconds to wait between polls with --loop (default: 5).",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            processed = run_pending_purge_jobs()
+            if processed:
+                self.stdout.write(self.style.SUCCESS(f"Processed {processed} purge jobs"))
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.employees.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the employee search index from the employees table."
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        indexed = backend.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f"Indexed {indexed} employees with {type(backend).__name__}")
+        )
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.employees.counters import reconcile_template
+from apps.employees.models import Employee
+from apps.forms.models import FormTemplate
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-template employee counters and fix any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--template",
+            type=int,
+            help="Only reconcile this form template id.",
+        )
+
+    def handle(self, *args, **options):
+        templates = FormTemplate.objects.order_by("id")
+        if options["template"]:
+            templates = templates.filter(id=options["template"])
+
+        checked = fixed = 0
+        for template in templates.iterator():
+            with transaction.atomic():
+                if reconcile_template(template, Employee.objects.all()):
+                    fixed += 1
+                    self.stdout.write(f"Fixed counters for template {template.id} ({template.name})")
+            checked += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Reconciled {checked} templates; {fixed} had drifted"
+        ))
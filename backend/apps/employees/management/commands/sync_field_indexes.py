@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from apps.employees.expressions import (
+    FIELD_INDEX_PREFIX, field_index, field_index_name, supports_data_keys,
+)
+from apps.employees.models import Employee
+from apps.forms.models import FormField
+
+
+class Command(BaseCommand):
+    help = (
+        "Create partial expression indexes on employee data for form fields "
+        "marked is_indexed, and drop indexes of fields that no longer are."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only print the indexes that would be created or dropped.",
+        )
+
+    def handle(self, *args, **options):
+        if not supports_data_keys(connection):
+            self.stderr.write(f"Field indexes are not supported on {connection.vendor}.")
+            return
+
+        table = Employee._meta.db_table
+        with connection.cursor() as cursor:
+            existing = {
+                name for name in connection.introspection.get_constraints(cursor, table)
+                if name.startswith(FIELD_INDEX_PREFIX)
+            }
+
+        wanted = {
+            field_index_name(field): field
+            for field in FormField.objects.filter(is_indexed=True)
+        }
+
+        with connection.schema_editor() as schema_editor:
+            for name, field in wanted.items():
+                if name in existing:
+                    continue
+                self.stdout.write(f"Creating {name} for {field}")
+                if not options["dry_run"]:
+                    schema_editor.add_index(Employee, field_index(field))
+
+            for name in sorted(existing - set(wanted)):
+                self.stdout.write(f"Dropping {name}")
+                if not options["dry_run"]:
+                    schema_editor.execute(schema_editor.sql_delete_index % {
+                        "table": schema_editor.quote_name(table),
+                        "name": schema_editor.quote_name(name),
+                    })
+
+        self.stdout.write(self.style.SUCCESS("Field indexes are in sync"))
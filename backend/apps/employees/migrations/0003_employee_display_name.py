@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-17 05:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0002_alter_employee_created_by_alter_employee_data_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='display_name',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=255),
+        ),
+    ]
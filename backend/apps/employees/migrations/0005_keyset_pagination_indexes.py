@@ -0,0 +1,24 @@
+# Generated by Django 5.2.6 on 2026-10-17 05:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0004_employee_search_index'),
+        ('forms', '0002_keyset_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['created_by', '-created_at', '-id'], name='employee_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['created_by', '-updated_at', '-id'], name='employee_user_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.6 on 2026-10-17 06:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0006_employeepurgejob'),
+        ('forms', '0004_access_path_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['created_by', 'is_active', '-created_at'], name='employee_user_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['created_by', 'form_template', '-created_at'], name='employee_user_template_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+from collections import Counter
+
+from django.db import migrations
+
+
+def backfill_counters(apps, schema_editor):
+    Employee = apps.get_model("employees", "Employee")
+    FormTemplate = apps.get_model("forms", "FormTemplate")
+    FormField = apps.get_model("forms", "FormField")
+
+    totals = Counter()
+    active = Counter()
+    filled = Counter()
+    rows = Employee.objects.values_list("form_template_id", "is_active", "data")
+    for template_id, is_active, data in rows.iterator(chunk_size=2000):
+        totals[template_id] += 1
+        active[template_id] += int(is_active)
+        if isinstance(data, dict):
+            for key, value in data.items():
+                if value is not None and value != "" and str(key).isdigit():
+                    filled[(template_id, int(key))] += 1
+
+    for template_id, count in totals.items():
+        FormTemplate.objects.filter(pk=template_id).update(
+            employee_count=count, active_employee_count=active[template_id]
+        )
+    for field in FormField.objects.filter(form_template_id__in=totals).only("id", "form_template_id"):
+        count = filled[(field.form_template_id, field.id)]
+        if count:
+            FormField.objects.filter(pk=field.pk).update(filled_count=count)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employees", "0007_access_path_indexes"),
+        ("forms", "0005_template_counters"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
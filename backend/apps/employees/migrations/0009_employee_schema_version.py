@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-17 06:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0008_backfill_template_counters'),
+        ('forms', '0006_template_schema_versions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='schema_version',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='employees', to='forms.formtemplateversion'),
+        ),
+    ]
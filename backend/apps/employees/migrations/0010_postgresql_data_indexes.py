@@ -0,0 +1,60 @@
+from django.db import migrations
+
+
+DATA_TEXT_FUNCTION = "employee_data_text"
+
+CREATE_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    # Values only, like the SQLite FTS table, so searches do not match the
+    # numeric field-id keys. IMMUTABLE so it can back an expression index.
+    f"""
+    CREATE OR REPLACE FUNCTION {DATA_TEXT_FUNCTION}(data jsonb) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+        SELECT CASE WHEN jsonb_typeof(data) = 'object' THEN
+            (SELECT string_agg(value, ' ') FROM jsonb_each_text(data))
+        END
+    $$
+    """,
+    # Serves containment (data @> '{"12": "IT"}') for per-field filters.
+    """
+    CREATE INDEX IF NOT EXISTS employees_employee_data_gin
+    ON employees_employee USING gin (data jsonb_path_ops)
+    """,
+    # Serves UPPER(employee_data_text(data)) LIKE UPPER('%...%') (icontains).
+    f"""
+    CREATE INDEX IF NOT EXISTS employees_employee_data_trgm
+    ON employees_employee USING gin (UPPER({DATA_TEXT_FUNCTION}(data)) gin_trgm_ops)
+    """,
+]
+
+DROP_SQL = [
+    "DROP INDEX IF EXISTS employees_employee_data_trgm",
+    "DROP INDEX IF EXISTS employees_employee_data_gin",
+    f"DROP FUNCTION IF EXISTS {DATA_TEXT_FUNCTION}(jsonb)",
+]
+
+
+def create_data_indexes(apps, schema_editor):
+    # Other engines keep the SQLite FTS index or the contains backend.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for statement in CREATE_SQL:
+        schema_editor.execute(statement)
+
+
+def drop_data_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for statement in DROP_SQL:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0009_employee_schema_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_data_indexes, drop_data_indexes),
+    ]
@@ -1,6 +1,12 @@
-from django.db import models
-from apps.forms.models import FormTemplate
+from django.db import models, transaction
+from apps.forms.models import FormTemplate, FormTemplateVersion
+from apps.forms.validation import get_template_validator
 from apps.authentication.models import CustomUser
+from .counters import CounterChanges
+
+DISPLAY_NAME_MAX_LENGTH = 255
+# Saving any of these moves the per-template counters (see counters.py)
+COUNTED_FIELDS = {"form_template", "is_active", "data"}
 
 
 class Employee(models.Model):
@@ -12,6 +18,20 @@ class Employee(models.Model):
     data = models.JSONField(
         default=dict,
     )
+    # Schema the data was last written against; null for older records
+    schema_version = models.ForeignKey(
+        FormTemplateVersion,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name="employees",
+    )
+    display_name = models.CharField(
+        max_length=DISPLAY_NAME_MAX_LENGTH,
+        blank=True,
+        default="",
+        db_index=True,
+    )
     created_by = models.ForeignKey(
         CustomUser,
         on_delete=models.CASCADE,
@@ -23,23 +43,64 @@ class Employee(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["created_by", "-created_at", "-id"],
+                name="employee_user_created_idx",
+            ),
+            models.Index(
+                fields=["created_by", "-updated_at", "-id"],
+                name="employee_user_updated_idx",
+            ),
+            models.Index(
+                fields=["created_by", "is_active", "-created_at"],
+                name="employee_user_active_idx",
+            ),
+            models.Index(
+                fields=["created_by", "form_template", "-created_at"],
+                name="employee_user_template_idx",
+            ),
+        ]
         verbose_name = "Employee"
         verbose_name_plural = "Employees"
 
     def __str__(self):
-        template = self.form_template
-        if template:                                        
-            name_fields = ["name", "full_name", "first_name", "employee_name"]
-            for field in template.fields.all():
-                if any(nf in field.label.lower() for nf in name_fields):
-                    value = self.data.get(field.id, "")
-                    if value:
-                        return str(value)
-        return f"Employee #{self.id}"
+        return self.display_name or f"Employee #{self.id}"
 
-    @property
-    def display_name(self):
-        return str(self)
+    def compute_display_name(self):
+        name = get_template_validator(self.form_template).display_name(self.data or {})
+        return name[:DISPLAY_NAME_MAX_LENGTH]
+
+    def save(self, *args, **kwargs):
+        self.display_name = self.compute_display_name()
+        self.schema_version_id = get_template_validator(self.form_template).version
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "data" in update_fields:
+            kwargs["update_fields"] = set(update_fields) | {"display_name", "schema_version"}
+        counted = update_fields is None or bool(
+            COUNTED_FIELDS.intersection(kwargs["update_fields"])
+        )
+
+        with transaction.atomic():
+            changes = CounterChanges()
+            if counted and self.pk is not None:
+                previous = Employee.objects.filter(pk=self.pk).values_list(
+                    "form_template_id", "is_active", "data"
+                ).first()
+                if previous is not None:
+                    changes.remove(*previous)
+            super().save(*args, **kwargs)
+            if counted:
+                changes.add(self.form_template_id, self.is_active, self.data)
+                changes.apply()
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            changes = CounterChanges()
+            changes.remove(self.form_template_id, self.is_active, self.data)
+            result = super().delete(*args, **kwargs)
+            changes.apply()
+        return result
 
     def get_field_value(self, field_id):
         return self.data.get(field_id)
@@ -48,39 +109,40 @@ class Employee(models.Model):
         self.data[field_id] = value
 
     def validate_data_against_template(self):
-        template = self.form_template
-        errors = []
-        
-        for field in template.fields.all():
-            value = self.data.get(field.id)
-            
-            if field.is_required and (not value or str(value).strip() == ""):
-                errors.append(f"{field.label} is required")
-                continue
-            
-            if not value or str(value).strip() == "":
-                continue
-                
-            if field.field_type == "EMAIL":
-                import re
-                if not re.match(r'^[^\s@]+@[^\s@]+\.[^\s@]+$', str(value)):
-                    errors.append(f"{field.label} must be a valid email")
-            
-            elif field.field_type == "NUMBER":
-                try:
-                    float(value)
-                except (ValueError, TypeError):
-                    errors.append(f"{field.label} must be a valid number")
-            
-            elif field.field_type == "DATE":
-                try:
-                    from datetime import datetime
-                    datetime.strptime(str(value), '%Y-%m-%d')
-                except ValueError:
-                    errors.append(f"{field.label} must be a valid date (YYYY-MM-DD)")
-            
-            elif field.field_type == "SELECT":
-                if field.options and value not in field.options:
-                    errors.append(f"{field.label} must be one of: {', '.join(field.options)}")
-        
-        return errors
+        return get_template_validator(self.form_template).validate(self.data)
+
+
+class EmployeePurgeJob(models.Model):
+    STATUS_CHOICES = [
+        ("PENDING", "Pending"),
+        ("RUNNING", "Running"),
+        ("COMPLETED", "Completed"),
+        ("FAILED", "Failed"),
+    ]
+    created_by = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name="employee_purge_jobs"
+    )
+    employee_ids = models.JSONField(default=list)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="PENDING")
+    total_count = models.PositiveIntegerField(default=0)
+    deleted_count = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "Employee Purge Job"
+        verbose_name_plural = "Employee Purge Jobs"
+
+    def __str__(self):
+        return f"Purge job #{self.id} ({self.status})"
+
+    @property
+    def progress(self):
+        if not self.total_count:
+            return 100.0
+        return round(self.deleted_count * 100 / self.total_count, 2)
@@ -0,0 +1,62 @@
+from django.db import connection
+
+from .expressions import DataKey, supports_data_keys
+
+
+# Model columns each serializer attribute needs when a sparse fieldset is requested.
+FIELD_COLUMNS = {
+    "id": ("id",),
+    "form_template": ("form_template",),
+    "form_template_name": ("form_template", "form_template__name"),
+    "data": ("data",),
+    "display_name": ("display_name",),
+    "template_fields": ("form_template",),
+    "schema_version": ("schema_version",),
+    "created_by": ("created_by",),
+    "created_at": ("created_at",),
+    "updated_at": ("updated_at",),
+    "is_active": ("is_active",),
+}
+
+
+def parse_list(value):
+    """
+    Parse a comma separated query parameter into an ordered, de-duplicated list.
+    """
+    if not value:
+        return []
+    return list(dict.fromkeys(item.strip() for item in value.split(",") if item.strip()))
+
+
+def data_alias(index):
+    return f"projected_data_{index}"
+
+
+def project_queryset(queryset, fields, data_fields):
+    """
+    Shrink ``queryset`` to the columns needed for ``fields``.
+
+    When ``data_fields`` is given and the database can extract JSON keys,
+    only those keys are selected instead of the whole ``data`` column.
+    """
+    if fields:
+        columns = {"id"}
+        for name in fields:
+            columns.update(FIELD_COLUMNS.get(name, ()))
+        if "form_template__name" not in columns and "template_fields" not in fields:
+            queryset = queryset.select_related(None)
+    else:
+        columns = None
+
+    wants_data = not fields or "data" in fields
+    if wants_data and data_fields and supports_data_keys(connection):
+        queryset = queryset.annotate(
+            **{data_alias(index): DataKey(key) for index, key in enumerate(data_fields)}
+        )
+        if columns is None:
+            return queryset.defer("data")
+        columns.discard("data")
+
+    if columns is not None:
+        queryset = queryset.only(*columns)
+    return queryset
@@ -0,0 +1,124 @@
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .bulk import delete_employees
+from .counters import CounterChanges
+from .models import Employee, EmployeePurgeJob
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_purge_chunk_size():
+    return max(1, getattr(settings, "EMPLOYEE_PURGE_CHUNK_SIZE", 500))
+
+
+def claimable_jobs():
+    """
+    Jobs a worker may start: pending ones, and running ones whose worker
+    has not recorded progress within ``EMPLOYEE_PURGE_STALE_AFTER`` seconds
+    (the process died mid-purge).
+    """
+    stale_after = timedelta(seconds=getattr(settings, "EMPLOYEE_PURGE_STALE_AFTER", 300))
+    return EmployeePurgeJob.objects.filter(
+        Q(status="PENDING") | Q(status="RUNNING", updated_at__lt=timezone.now() - stale_after)
+    )
+
+
+def soft_delete(queryset, user):
+    """
+    Deactivate the employees in ``queryset`` with a single UPDATE and record
+    a purge job that hard-deletes them later.
+    """
+    with transaction.atomic():
+        rows = list(queryset.values_list("id", "form_template_id", "is_active"))
+        employee_ids = [employee_id for employee_id, _, _ in rows]
+        Employee.objects.filter(id__in=employee_ids).update(
+            is_active=False, updated_at=timezone.now()
+        )
+        counters = CounterChanges()
+        for _, template_id, is_active in rows:
+            if is_active:
+                # Data is untouched, so only the active count moves.
+                counters.change(template_id, (True, None), (False, None))
+        counters.apply()
+        job = EmployeePurgeJob.objects.create(
+            created_by=user,
+            employee_ids=employee_ids,
+            total_count=len(employee_ids),
+        )
+        if getattr(settings, "EMPLOYEE_PURGE_IN_PROCESS", True):
+            transaction.on_commit(lambda: start_purge_thread(job.id))
+    return job
+
+
+def start_purge_thread(job_id):
+    thread = threading.Thread(
+        target=_run_in_thread, args=(job_id,), name=f"employee-purge-{job_id}", daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def _run_in_thread(job_id):
+    try:
+        run_purge_job(job_id)
+    finally:
+        connection.close()
+
+
+def run_purge_job(job_id):
+    """
+    Hard-delete a job's employees in bounded chunks, one transaction each,
+    recording progress after every chunk so other writers are never blocked
+    for long. A stale running job is resumed; chunks that were already
+    deleted match no rows. Returns ``False`` if the job was already claimed.
+    """
+    claimed = claimable_jobs().filter(id=job_id).update(
+        status="RUNNING", updated_at=timezone.now()
+    )
+    if not claimed:
+        return False
+
+    job = EmployeePurgeJob.objects.get(id=job_id)
+    chunk_size = get_purge_chunk_size()
+    deleted = job.deleted_count
+
+    try:
+        for start in range(0, len(job.employee_ids), chunk_size):
+            with transaction.atomic():
+                deleted += delete_employees(Employee.objects.filter(
+                    id__in=job.employee_ids[start:start + chunk_size],
+                    created_by_id=job.created_by_id,
+                    is_active=False,
+                ))
+                EmployeePurgeJob.objects.filter(id=job.id).update(
+                    deleted_count=deleted, updated_at=timezone.now()
+                )
+    except Exception as exc:
+        logger.exception("Employee purge job %s failed", job.id)
+        EmployeePurgeJob.objects.filter(id=job.id).update(
+            status="FAILED", error=str(exc), finished_at=timezone.now(), updated_at=timezone.now()
+        )
+        return True
+
+    EmployeePurgeJob.objects.filter(id=job.id).update(
+        status="COMPLETED", finished_at=timezone.now(), updated_at=timezone.now()
+    )
+    return True
+
+
+def run_pending_purge_jobs():
+    processed = 0
+    pending = claimable_jobs().order_by("created_at")
+    for job_id in pending.values_list("id", flat=True):
+        close_old_connections()
+        if run_purge_job(job_id):
+            processed += 1
+    return processed
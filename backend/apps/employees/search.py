@@ -0,0 +1,148 @@
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import F, Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from apps.forms.models import FormTemplate
+from .expressions import DATA_TEXT_FUNCTION, DataText
+from .models import Employee
+
+
+FTS_TABLE = "employees_employee_fts"
+FTS_VALUES_SQL = "SELECT group_concat(value, ' ') FROM json_each(%s)"
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class BaseSearchBackend:
+    """
+    Interface for employee value search.
+
+    ``filter`` narrows a queryset to employees whose template name or data
+    values match ``query``; ``rank`` orders an already filtered queryset by
+    relevance where the backend supports it.
+    """
+
+    supports_ranking = False
+
+    def filter(self, queryset, query):
+        raise NotImplementedError
+
+    def rank(self, queryset):
+        return queryset
+
+    def rebuild(self):
+        return 0
+
+
+class ContainsSearchBackend(BaseSearchBackend):
+    """
+    Fallback for engines without a dedicated index: a substring scan over
+    the serialized JSON blob.
+    """
+
+    def filter(self, queryset, query):
+        return queryset.filter(
+            Q(form_template__name__icontains=query) | Q(data__icontains=query)
+        )
+
+
+class PostgreSQLTrigramSearchBackend(BaseSearchBackend):
+    """
+    Substring search over the data values (not the JSON keys), served by the
+    ``pg_trgm`` GIN index on ``UPPER(employee_data_text(data))``.
+
+    Template names are matched through a subquery on the template id so the
+    two conditions can be combined as a bitmap OR on the employee table.
+    """
+
+    def filter(self, queryset, query):
+        templates = FormTemplate.objects.filter(name__icontains=query).values("id")
+        return queryset.alias(data_text=DataText()).filter(
+            Q(form_template_id__in=templates) | Q(data_text__icontains=query)
+        )
+
+
+class SQLiteFTSSearchBackend(BaseSearchBackend):
+    """
+    Search over the ``employees_employee_fts`` FTS5 table.
+
+    The table holds only the data values (not the JSON keys) of every
+    employee and is kept in sync by triggers on ``employees_employee``, so
+    single saves, bulk operations and deletes are all covered.
+    """
+
+    supports_ranking = True
+
+    def __init__(self, using="default"):
+        self.using = using
+
+    def filter(self, queryset, query):
+        match = build_match_expression(query)
+        if not match:
+            return queryset.filter(form_template__name__icontains=query)
+
+        employee_table = connections[self.using].ops.quote_name(Employee._meta.db_table)
+        matched_ids = RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]
+        )
+        rank = RawSQL(
+            f"SELECT rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+            f"AND rowid = {employee_table}.id",
+            [match],
+        )
+        return queryset.filter(
+            Q(form_template__name__icontains=query) | Q(id__in=matched_ids)
+        ).annotate(search_rank=rank)
+
+    def rank(self, queryset):
+        return queryset.order_by(F("search_rank").asc(nulls_last=True), "-created_at")
+
+    def rebuild(self):
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}(rowid, value_text) "
+                f"SELECT id, ({FTS_VALUES_SQL % 'data'}) FROM {Employee._meta.db_table}"
+            )
+            return cursor.rowcount
+
+
+def build_match_expression(query):
+    """
+    Turn free text into an FTS5 expression where every token is a quoted
+    prefix match, e.g. ``jo smi`` -> ``"jo"* "smi"*``.
+    """
+    tokens = TOKEN_PATTERN.findall(query or "")
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+@lru_cache(maxsize=None)
+def get_search_backend(using="default"):
+    backend_path = getattr(settings, "EMPLOYEE_SEARCH_BACKEND", None)
+    if backend_path:
+        return import_string(backend_path)()
+
+    connection = connections[using]
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            tables = connection.introspection.table_names(cursor)
+        if FTS_TABLE in tables:
+            return SQLiteFTSSearchBackend(using)
+    elif connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT to_regproc(%s) IS NOT NULL", [DATA_TEXT_FUNCTION])
+            if cursor.fetchone()[0]:
+                return PostgreSQLTrigramSearchBackend()
+    return ContainsSearchBackend()
+
+
+def search_employees(queryset, query, ordered=True):
+    backend = get_search_backend()
+    queryset = backend.filter(queryset, query)
+    if ordered and backend.supports_ranking:
+        queryset = backend.rank(queryset)
+    return queryset
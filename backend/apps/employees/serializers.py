@@ -1,10 +1,58 @@
 from rest_framework import serializers
 from drf_spectacular.utils import extend_schema_serializer, OpenApiExample
-from .models import Employee
+from .models import Employee, EmployeePurgeJob
+from .projection import data_alias, parse_list
 from apps.forms.models import FormTemplate, FormField
 from apps.forms.serializers import FormFieldSerializer
 
 
+class ProjectedDataField(serializers.Field):
+    """
+    Read-only ``data`` restricted to the keys requested with ``?data_fields=``.
+
+    Reads the per-key annotations added by ``project_queryset`` when the
+    ``data`` column itself was not loaded.
+    """
+
+    def __init__(self, keys, **kwargs):
+        self.keys = keys
+        kwargs["source"] = "*"
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        if "data" in instance.get_deferred_fields():
+            values = (
+                (key, getattr(instance, data_alias(index), None))
+                for index, key in enumerate(self.keys)
+            )
+        else:
+            values = ((key, instance.data.get(key)) for key in self.keys)
+        return {key: value for key, value in values if value is not None}
+
+
+class SparseFieldsetMixin:
+    """
+    Lets GET requests choose attributes with ``?fields=`` and form-field keys
+    of ``data`` with ``?data_fields=``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request is None or request.method != "GET":
+            return
+
+        fields = parse_list(request.query_params.get("fields"))
+        if fields:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+        data_fields = parse_list(request.query_params.get("data_fields"))
+        if data_fields and "data" in self.fields:
+            self.fields["data"] = ProjectedDataField(data_fields)
+
+
 @extend_schema_serializer(
     examples=[
         OpenApiExample(
@@ -42,6 +90,7 @@ from apps.forms.serializers import FormFieldSerializer
                         "options": []
                     }
                 ],
+                "schema_version": "9f2c4e0b7d1a...",
                 "created_by": 1,
                 "created_at": "2024-01-01T00:00:00Z",
                 "updated_at": "2024-01-01T00:00:00Z",
@@ -50,7 +99,7 @@ from apps.forms.serializers import FormFieldSerializer
         )
     ]
 )
-class EmployeeSerializer(serializers.ModelSerializer):
+class EmployeeSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Complete employee serializer with all fields and relationships.
     
@@ -59,17 +108,17 @@ class EmployeeSerializer(serializers.ModelSerializer):
     retrieval and full updates.
     """
     form_template_name = serializers.CharField(source='form_template.name', read_only=True)
-    display_name = serializers.CharField(read_only=True)
+    display_name = serializers.CharField(source='__str__', read_only=True)
     template_fields = FormFieldSerializer(source='form_template.fields', many=True, read_only=True)
     
     class Meta:
         model = Employee
         fields = [
             'id', 'form_template', 'form_template_name', 'data', 
-            'display_name', 'template_fields', 'created_by', 
+            'display_name', 'template_fields', 'schema_version', 'created_by', 
             'created_at', 'updated_at', 'is_active'
         ]
-        read_only_fields = ['id', 'created_by', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'schema_version', 'created_by', 'created_at', 'updated_at']
 
     def validate_data(self, value):
         if not isinstance(value, dict):
@@ -122,7 +171,7 @@ class EmployeeCreateSerializer(serializers.ModelSerializer):
     ensures all required fields are provided.
     """
     form_template_name = serializers.CharField(source='form_template.name', read_only=True)
-    display_name = serializers.CharField(read_only=True)
+    display_name = serializers.CharField(source='__str__', read_only=True)
     
     class Meta:
         model = Employee
@@ -178,7 +227,7 @@ class EmployeeCreateSerializer(serializers.ModelSerializer):
         )
     ]
 )
-class EmployeeListSerializer(serializers.ModelSerializer):
+class EmployeeListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Lightweight serializer for employee lists.
     
@@ -187,7 +236,7 @@ class EmployeeListSerializer(serializers.ModelSerializer):
     performance when displaying multiple employees.
     """
     form_template_name = serializers.CharField(source='form_template.name', read_only=True)
-    display_name = serializers.CharField(read_only=True)
+    display_name = serializers.CharField(source='__str__', read_only=True)
     
     class Meta:
         model = Employee
@@ -197,6 +246,59 @@ class EmployeeListSerializer(serializers.ModelSerializer):
         ]
 
 
+@extend_schema_serializer(
+    examples=[
+        OpenApiExample(
+            "Employee Values Example",
+            summary="Employee values in a template envelope",
+            description="Employee entry of a by_template or search response with envelope=template",
+            value={
+                "id": 1,
+                "form_template": 1,
+                "data": {
+                    "1": "John Doe",
+                    "2": "john@example.com"
+                },
+                "display_name": "John Doe",
+                "created_at": "2024-01-01T00:00:00Z",
+                "updated_at": "2024-01-01T00:00:00Z",
+                "is_active": True
+            }
+        )
+    ]
+)
+class EmployeeValuesSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    Employee values without any template information.
+
+    Used inside the template envelope of by_template and search responses,
+    where the template schema is serialized once next to the results.
+    """
+    display_name = serializers.CharField(source='__str__', read_only=True)
+
+    class Meta:
+        model = Employee
+        fields = [
+            'id', 'form_template', 'data', 'display_name', 'schema_version',
+            'created_at', 'updated_at', 'is_active'
+        ]
+
+
+class EmployeeTemplateSchemaSerializer(serializers.ModelSerializer):
+    """
+    Template schema (name and ordered fields) shared by the employees of an envelope.
+
+    Fields come from the template's current schema version snapshot, which
+    must be loaded (see ``apps.forms.versions.get_schema_version``).
+    """
+    schema_version = serializers.CharField(source='schema_version_id', read_only=True)
+    fields = serializers.JSONField(source='schema_version.schema', read_only=True)
+
+    class Meta:
+        model = FormTemplate
+        fields = ['id', 'name', 'schema_version', 'fields']
+
+
 @extend_schema_serializer(
     examples=[
         OpenApiExample(
@@ -224,7 +326,7 @@ class EmployeeUpdateSerializer(serializers.ModelSerializer):
     after employee creation.
     """
     form_template_name = serializers.CharField(source='form_template.name', read_only=True)
-    display_name = serializers.CharField(read_only=True)
+    display_name = serializers.CharField(source='__str__', read_only=True)
     
     class Meta:
         model = Employee
@@ -256,3 +358,41 @@ class EmployeeUpdateSerializer(serializers.ModelSerializer):
                 })
         
         return attrs
+
+
+@extend_schema_serializer(
+    examples=[
+        OpenApiExample(
+            "Purge Job Example",
+            summary="Background purge job",
+            description="Progress of a soft bulk delete being purged in the background",
+            value={
+                "id": 1,
+                "status": "RUNNING",
+                "total_count": 20000,
+                "deleted_count": 5000,
+                "progress": 25.0,
+                "error": "",
+                "created_at": "2024-01-01T00:00:00Z",
+                "updated_at": "2024-01-01T00:00:05Z",
+                "finished_at": None
+            }
+        )
+    ]
+)
+class EmployeePurgeJobSerializer(serializers.ModelSerializer):
+    """
+    Read-only serializer for background employee purge jobs.
+
+    Reports how many of the soft-deleted employees have been hard-deleted
+    so far, so clients can poll a large cleanup to completion.
+    """
+    progress = serializers.ReadOnlyField()
+
+    class Meta:
+        model = EmployeePurgeJob
+        fields = [
+            'id', 'status', 'total_count', 'deleted_count', 'progress',
+            'error', 'created_at', 'updated_at', 'finished_at'
+        ]
+        read_only_fields = fields
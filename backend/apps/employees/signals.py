@@ -0,0 +1,130 @@
+import logging
+import threading
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.forms.models import FormField
+from apps.forms.signals import fields_reordered
+from apps.forms.validation import is_name_label
+from .analytics import filled
+from .bulk import refresh_display_names
+from .models import Employee
+
+
+logger = logging.getLogger(__name__)
+
+# Templates with a refresh thread running, and those changed again meanwhile.
+_refresh_lock = threading.Lock()
+_refreshing = set()
+_refresh_again = set()
+
+
+def refresh_template_display_names(template_id):
+    return refresh_display_names(
+        Employee.objects.filter(form_template_id=template_id),
+        getattr(settings, "EMPLOYEE_BULK_CHUNK_SIZE", 500),
+    )
+
+
+def _schedule_refresh(template_id):
+    if getattr(settings, "EMPLOYEE_DISPLAY_NAME_REFRESH_IN_BACKGROUND", True):
+        transaction.on_commit(lambda: start_refresh_thread(template_id))
+    else:
+        transaction.on_commit(lambda: refresh_template_display_names(template_id))
+
+
+def start_refresh_thread(template_id):
+    """
+    Refresh a template's display names off the request thread. Changes that
+    arrive while a refresh runs are folded into one more pass by that thread.
+    """
+    with _refresh_lock:
+        if template_id in _refreshing:
+            _refresh_again.add(template_id)
+            return None
+        _refreshing.add(template_id)
+    thread = threading.Thread(
+        target=_refresh_in_thread,
+        args=(template_id,),
+        name=f"employee-display-names-{template_id}",
+        daemon=True,
+    )
+    thread.start()
+    return thread
+
+
+def _refresh_in_thread(template_id):
+    try:
+        while True:
+            refresh_template_display_names(template_id)
+            with _refresh_lock:
+                if template_id not in _refresh_again:
+                    return
+                _refresh_again.discard(template_id)
+    except Exception:
+        logger.exception("Refreshing display names for template %s failed", template_id)
+    finally:
+        with _refresh_lock:
+            _refreshing.discard(template_id)
+            _refresh_again.discard(template_id)
+        connection.close()
+
+
+@receiver(pre_save, sender=FormField)
+def track_name_field_change(sender, instance, **kwargs):
+    previous = None
+    if instance.pk:
+        previous = getattr(instance, "_loaded_values", None)
+        if previous is None or not {"label", "order", "field_type"} <= previous.keys():
+            previous = FormField.objects.filter(pk=instance.pk).values(
+                "label", "order", "field_type"
+            ).first()
+
+    if previous is None:
+        instance._affects_display_name = is_name_label(instance.label)
+        instance._affects_filled_count = False
+    else:
+        changed = previous["label"] != instance.label or previous["order"] != instance.order
+        instance._affects_display_name = changed and (
+            is_name_label(previous["label"]) or is_name_label(instance.label)
+        )
+        # Only NUMBER fields count non-numeric values as missing.
+        instance._affects_filled_count = previous["field_type"] != instance.field_type and (
+            "NUMBER" in (previous["field_type"], instance.field_type)
+        )
+
+
+@receiver(post_save, sender=FormField)
+def refresh_display_names_on_field_save(sender, instance, **kwargs):
+    instance._loaded_values = {
+        **getattr(instance, "_loaded_values", {}),
+        "label": instance.label,
+        "order": instance.order,
+        "field_type": instance.field_type,
+    }
+    if getattr(instance, "_affects_display_name", False):
+        _schedule_refresh(instance.form_template_id)
+
+
+@receiver(post_save, sender=FormField)
+def recount_filled_on_type_change(sender, instance, **kwargs):
+    if getattr(instance, "_affects_filled_count", False):
+        instance.filled_count = filled(
+            Employee.objects.filter(form_template_id=instance.form_template_id), instance
+        ).count()
+        FormField.objects.filter(pk=instance.pk).update(filled_count=instance.filled_count)
+
+
+@receiver(post_delete, sender=FormField)
+def refresh_display_names_on_field_delete(sender, instance, **kwargs):
+    if is_name_label(instance.label):
+        _schedule_refresh(instance.form_template_id)
+
+
+@receiver(fields_reordered)
+def refresh_display_names_on_reorder(sender, form_template_id, fields, **kwargs):
+    if any(is_name_label(field.label) for field in fields):
+        _schedule_refresh(form_template_id)
@@ -1,3 +1,1145 @@
-from django.test import TestCase
+import csv
+import json
+import re
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, router
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from apps.authentication.models import CustomUser
+from apps.forms.models import FormField, FormTemplate
+from employee_management.pagination import DefaultPagination
+from .models import Employee, EmployeePurgeJob
+from .purge import run_pending_purge_jobs, soft_delete
+from .search import PostgreSQLTrigramSearchBackend, get_search_backend
+from .views import EmployeeViewSet
+
+
+class EmployeeDataQueryTests(TestCase):
+    """
+    Per-field filters and search over ``Employee.data`` on every supported
+    database. Run against PostgreSQL with ``scripts/test_postgresql.sh``.
+    """
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            username="owner", email="owner@example.com", password="password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.template = FormTemplate.objects.create(name="Staff", created_by=self.user)
+        self.name = FormField.objects.create(
+            form_template=self.template, field_type="TEXT", label="Full Name",
+            is_required=True, order=0,
+        )
+        self.department = FormField.objects.create(
+            form_template=self.template, field_type="SELECT", label="Department",
+            options=["IT", "HR", "Sales"], order=1,
+        )
+        self.salary = FormField.objects.create(
+            form_template=self.template, field_type="NUMBER", label="Salary", order=2,
+        )
+        self.template.refresh_from_db()
+        for name, department, salary in [
+            ("Ada Lovelace", "IT", "120000"),
+            ("Grace Hopper", "IT", "95000"),
+            ("Alan Turing", "HR", "70000"),
+            ("Edsger Dijkstra", "Sales", "60000"),
+        ]:
+            Employee.objects.create(
+                form_template=self.template,
+                created_by=self.user,
+                data={
+                    str(self.name.id): name,
+                    str(self.department.id): department,
+                    str(self.salary.id): salary,
+                },
+            )
+
+    def get_names(self, query):
+        response = self.client.get(f"/api/employees/employees/?{query}")
+        self.assertEqual(response.status_code, 200, response.content)
+        return sorted(employee["display_name"] for employee in response.data["results"])
+
+    def test_field_filters(self):
+        field = f"field_{self.department.id}"
+        self.assertEqual(self.get_names(f"{field}=IT"), ["Ada Lovelace", "Grace Hopper"])
+        self.assertEqual(
+            self.get_names(f"{field}__in=HR,Sales"), ["Alan Turing", "Edsger Dijkstra"]
+        )
+        self.assertEqual(self.get_names(f"{field}=Finance"), [])
+        self.assertEqual(
+            self.get_names(f"field_{self.salary.id}__gte=90000"),
+            ["Ada Lovelace", "Grace Hopper"],
+        )
+
+    def test_in_filter_values_with_commas(self):
+        employee = Employee.objects.get(display_name="Alan Turing")
+        employee.data[str(self.department.id)] = "R&D, Europe"
+        employee.save()
+
+        field = f"field_{self.department.id}__in"
+        expected = ["Alan Turing", "Edsger Dijkstra"]
+        self.assertEqual(self.get_names(f"{field}=R%26D%5C,%20Europe,Sales"), expected)
+        self.assertEqual(self.get_names(f"{field}=R%26D,%20Europe&{field}=Sales"), expected)
+
+    def test_text_filters_match_stored_numbers_and_booleans(self):
+        code = FormField.objects.create(
+            form_template=self.template, field_type="TEXT", label="Code", order=3,
+        )
+        for employee, value in zip(Employee.objects.order_by("id"), [123, True, "123", "x"]):
+            employee.data[str(code.id)] = value
+            employee.save()
+
+        field = f"field_{code.id}"
+        self.assertEqual(self.get_names(f"{field}=123"), ["Ada Lovelace", "Alan Turing"])
+        self.assertEqual(self.get_names(f"{field}__in=x,true"), ["Edsger Dijkstra", "Grace Hopper"])
+
+    def test_number_filters_skip_non_numeric_values(self):
+        Employee.objects.create(
+            form_template=self.template,
+            created_by=self.user,
+            data={str(self.name.id): "Blank Salary", str(self.department.id): "HR",
+                  str(self.salary.id): ""},
+        )
+        field = f"field_{self.salary.id}"
+        self.assertEqual(
+            self.get_names(f"{field}__lte=80000"), ["Alan Turing", "Edsger Dijkstra"]
+        )
+
+        response = self.client.get(
+            f"/api/employees/employees/analytics/?template_id={self.template.id}"
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        salary = next(f for f in response.data["fields"] if f["id"] == self.salary.id)
+        self.assertEqual((salary["filled"], salary["missing"], salary["min"]), (4, 1, 60000))
+
+    def test_number_filters_after_field_type_change(self):
+        level = FormField.objects.create(
+            form_template=self.template, field_type="TEXT", label="Level", order=3,
+        )
+        for employee, value in zip(Employee.objects.order_by("id"), ["n/a", "3", "7", "1-2"]):
+            employee.data[str(level.id)] = value
+            employee.save()
+        level.field_type = "NUMBER"
+        level.save()
+
+        self.assertEqual(
+            self.get_names(f"field_{level.id}__gte=0"), ["Alan Turing", "Grace Hopper"]
+        )
+
+    def test_search_matches_values(self):
+        self.assertEqual(self.get_names("search=hopp"), ["Grace Hopper"])
+        self.assertEqual(len(self.get_names("search=staff")), 4)
+
+    @skipUnless(connection.vendor == "postgresql", "PostgreSQL only")
+    def test_postgresql_uses_jsonb_indexes(self):
+        with CaptureQueriesContext(connection) as context:
+            self.get_names(f"field_{self.department.id}=IT")
+        self.assertTrue(any("@>" in query["sql"] for query in context.captured_queries))
+
+        self.assertIsInstance(get_search_backend(), PostgreSQLTrigramSearchBackend)
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, Employee._meta.db_table
+            )
+        self.assertIn("employees_employee_data_gin", constraints)
+        self.assertIn("employees_employee_data_trgm", constraints)
+
+
+@override_settings(EMPLOYEE_PURGE_IN_PROCESS=False, EMPLOYEE_PURGE_CHUNK_SIZE=2)
+class EmployeePurgeJobTests(TestCase):
+    """
+    Jobs left RUNNING by a worker that died are resumed once they stop
+    making progress; jobs that are still moving are left alone.
+    """
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            username="owner", email="owner@example.com", password="password"
+        )
+        self.template = FormTemplate.objects.create(name="Staff", created_by=self.user)
+
+    def create_job(self, count):
+        for number in range(count):
+            Employee.objects.create(
+                form_template=self.template, created_by=self.user, data={"1": str(number)}
+            )
+        return soft_delete(Employee.objects.filter(is_active=True), self.user)
+
+    def test_stale_running_job_is_resumed(self):
+        job = self.create_job(3)
+        # A worker deleted the first chunk, then died.
+        Employee.objects.filter(id__in=job.employee_ids[:2]).delete()
+        EmployeePurgeJob.objects.filter(id=job.id).update(
+            status="RUNNING", deleted_count=2, updated_at=timezone.now() - timedelta(hours=1)
+        )
+
+        self.assertEqual(run_pending_purge_jobs(), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.deleted_count), ("COMPLETED", 3))
+        self.assertFalse(Employee.objects.exists())
+
+    def test_running_job_with_recent_progress_is_not_claimed(self):
+        job = self.create_job(2)
+        EmployeePurgeJob.objects.filter(id=job.id).update(
+            status="RUNNING", updated_at=timezone.now()
+        )
+
+        self.assertEqual(run_pending_purge_jobs(), 0)
+        job.refresh_from_db()
+        self.assertEqual(job.status, "RUNNING")
+        self.assertEqual(Employee.objects.count(), 2)
+
+
+class EmployeeConditionalListTests(TestCase):
+    """
+    Revalidating the employee list answers 304 only while nothing it shows
+    has changed, with either validator a client sends back.
+    """
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            username="owner", email="owner@example.com", password="password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.template = FormTemplate.objects.create(name="Staff", created_by=self.user)
+        self.name = FormField.objects.create(
+            form_template=self.template, field_type="TEXT", label="Full Name", order=0,
+        )
+        self.employees = [
+            Employee.objects.create(
+                form_template=self.template,
+                created_by=self.user,
+                data={str(self.name.id): name},
+            )
+            for name in ["Ada Lovelace", "Grace Hopper"]
+        ]
+
+    def get_list(self, path="/api/employees/employees/", **headers):
+        return self.client.get(path, headers=headers)
+
+    def assert_revalidation(self, change, path="/api/employees/employees/"):
+        response = self.get_list(path)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        self.assertEqual(self.get_list(path, **{"If-None-Match": etag}).status_code, 304)
+
+        change()
+        response = self.get_list(path, **{"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_list_sends_no_last_modified(self):
+        self.assertNotIn("Last-Modified", self.get_list())
+
+    def test_update_invalidates_list(self):
+        employee = self.employees[0]
+        self.assert_revalidation(lambda: self.client.patch(
+            f"/api/employees/employees/{employee.id}/",
+            {"data": {str(self.name.id): "Ada King"}},
+            format="json",
+        ))
+
+    def test_delete_invalidates_list(self):
+        employee = self.employees[0]
+        self.assert_revalidation(
+            lambda: self.client.delete(f"/api/employees/employees/{employee.id}/")
+        )
+
+    def test_template_field_change_invalidates_list(self):
+        self.assert_revalidation(lambda: self.client.patch(
+            f"/api/forms/form-fields/{self.name.id}/", {"label": "Name"}, format="json"
+        ))
+
+    def test_bulk_update_invalidates_list_and_detail(self):
+        employee = self.employees[0]
+        names = iter(["Ada King", "Augusta Ada King"])
+
+        def change():
+            response = self.client.patch(
+                "/api/employees/employees/bulk_update/",
+                [{"id": employee.id, "data": {str(self.name.id): next(names)}}],
+                format="json",
+            )
+            self.assertEqual(response.data["updated_count"], 1)
+
+        self.assert_revalidation(change)
+        self.assert_revalidation(change, f"/api/employees/employees/{employee.id}/")
+
+    def test_soft_delete_invalidates_list(self):
+        self.assert_revalidation(lambda: self.client.delete(
+            "/api/employees/employees/bulk_delete/?mode=soft",
+            {"employee_ids": [self.employees[0].id]},
+            format="json",
+        ))
+
+    @override_settings(EMPLOYEE_DISPLAY_NAME_REFRESH_IN_BACKGROUND=False)
+    def test_display_name_refresh_invalidates_list_and_detail(self):
+        title = FormField.objects.create(
+            form_template=self.template, field_type="TEXT", label="Title", order=0,
+        )
+        self.name.order = 1
+        self.name.save()
+        employee = self.employees[0]
+        employee.data[str(title.id)] = "Countess"
+        employee.save()
+        detail = f"/api/employees/employees/{employee.id}/"
+
+        # Names are refreshed after the rename commits.
+        with self.captureOnCommitCallbacks() as callbacks:
+            title.label = "Preferred Name"
+            title.save()
+        self.assertEqual(len(callbacks), 1)
+
+        def refresh():
+            callbacks[0]()
+
+        self.assert_revalidation(refresh, detail)
+        self.assertEqual(self.get_list(detail).data["display_name"], "Countess")
+
+    def test_if_modified_since_never_hides_a_delete(self):
+        # What a client would send after fetching the list just now.
+        since = http_date(time.time() + 1)
+        self.client.delete(f"/api/employees/employees/{self.employees[0].id}/")
+
+        response = self.get_list(**{"If-Modified-Since": since})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 1)
+
+
+@override_settings(EMPLOYEE_DISPLAY_NAME_REFRESH_IN_BACKGROUND=False)
+class DisplayNameRefreshTests(TestCase):
+    """
+    Stored display names follow changes to a template's name fields, and
+    other field edits neither re-read the field nor schedule a refresh.
+    """
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            username="owner", email="owner@example.com", password="password"
+        )
+        self.template = FormTemplate.objects.create(name="Staff", created_by=self.user)
+        self.title = FormField.objects.create(
+            form_template=self.template, field_type="TEXT", label="Title", order=0,
+        )
+        self.name = FormField.objects.create(
+            form_template=self.template, field_type="TEXT", label="Full Name", order=1,
+        )
+        self.employee = Employee.objects.create(
+            form_template=self.template,
+            created_by=self.user,
+            data={str(self.title.id): "Countess", str(self.name.id): "Ada Lovelace"},
+        )
+
+    def test_renaming_a_field_to_a_name_label_refreshes_display_names(self):
+        updated_at = self.employee.updated_at
+        field = FormField.objects.get(pk=self.title.pk)
+        field.label = "Preferred Name"
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            field.save()
+
+        self.assertEqual(len(callbacks), 1)
+        self.employee.refresh_from_db()
+        self.assertEqual(self.employee.display_name, "Countess")
+        self.assertGreater(self.employee.updated_at, updated_at)
+
+    def test_other_field_changes_schedule_nothing(self):
+        field = FormField.objects.get(pk=self.name.pk)
+        field.placeholder = "Jane Doe"
+        # full_clean's two existence checks, the UPDATE, and the template's
+        # schema version reset; the field is not read back.
+        with self.assertNumQueries(4), self.captureOnCommitCallbacks() as callbacks:
+            field.save()
+        self.assertEqual(callbacks, [])
+
+
+class EmployeeBulkCreateTests(TestCase):
+    """
+    Rows posted to ``bulk_create`` are parsed like a single create.
+    """
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            username="owner", email="owner@example.com", password="password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.template = FormTemplate.objects.create(name="Staff", created_by=self.user)
+
+    def bulk_create(self, *values):
+        return self.client.post(
+            "/api/employees/employees/bulk_create/",
+            [{"form_template": self.template.id, "data": {}, "is_active": value} for value in values],
+            format="json",
+        )
+
+    def test_is_active_accepts_boolean_strings_and_numbers(self):
+        response = self.bulk_create(True, "false", 0, "0", "true", 1)
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(
+            list(Employee.objects.order_by("id").values_list("is_active", flat=True)),
+            [True, False, False, False, True, True],
+        )
+
+    def test_invalid_is_active_is_a_row_error(self):
+        response = self.bulk_create(True, "maybe")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["errors"][0]["index"], 1)
+        self.assertIn("is_active", response.data["errors"][0]["errors"])
+        self.assertFalse(Employee.objects.exists())
+
+
+class TemplateCounterTests(TestCase):
+    """
+    Template and field counters follow employee writes with one UPDATE per
+    table per operation, and ``reconcile_template_counters`` repairs drift.
+    """
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            username="owner", email="owner@example.com", password="password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.templates = [
+            FormTemplate.objects.create(name=name, created_by=self.user)
+            for name in ["Staff", "Contractors"]
+        ]
+        self.fields = [
+            FormField.objects.create(
+                form_template=template, field_type="TEXT", label="Full Name", order=0,
+            )
+            for template in self.templates
+        ]
+
+    def assert_counters(self, template, employee_count, active_count, filled_count):
+        template.refresh_from_db()
+        self.assertEqual(
+            (template.employee_count, template.active_employee_count), (employee_count, active_count)
+        )
+        self.assertEqual(template.fields.get().filled_count, filled_count)
+
+    def bulk_create(self):
+        rows = [
+            {"form_template": template.id, "data": {str(field.id): name}, "is_active": is_active}
+            for template, field in zip(self.templates, self.fields)
+            for name, is_active in [("Ada", True), ("", True), ("Grace", False)]
+        ]
+        response = self.client.post(
+            "/api/employees/employees/bulk_create/", rows, format="json"
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.data["employee_ids"]
+
+    def counter_updates(self, context):
+        return [
+            query["sql"].split(" SET ")[0] for query in context.captured_queries
+            if query["sql"].startswith("UPDATE") and "_count" in query["sql"]
+        ]
+
+    def test_bulk_writes_update_counters_once_per_table(self):
+        with CaptureQueriesContext(connection) as context:
+            employee_ids = self.bulk_create()
+        self.assertEqual(
+            self.counter_updates(context),
+            ['UPDATE "forms_formtemplate"', 'UPDATE "forms_formfield"'],
+        )
+        for template in self.templates:
+            self.assert_counters(template, 3, 2, 2)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.delete(
+                "/api/employees/employees/bulk_delete/",
+                {"employee_ids": employee_ids[:2] + employee_ids[3:4]},
+                format="json",
+            )
+        self.assertEqual(response.data["deleted_count"], 3)
+        self.assertEqual(
+            self.counter_updates(context),
+            ['UPDATE "forms_formtemplate"', 'UPDATE "forms_formfield"'],
+        )
+        self.assert_counters(self.templates[0], 1, 0, 1)
+        self.assert_counters(self.templates[1], 2, 1, 1)
+
+    def test_single_writes_update_counters(self):
+        template, field = self.templates[0], self.fields[0]
+        employee = Employee.objects.create(
+            form_template=template, created_by=self.user, data={str(field.id): "Ada"}
+        )
+        self.assert_counters(template, 1, 1, 1)
+
+        employee.data = {str(field.id): ""}
+        employee.is_active = False
+        employee.save()
+        self.assert_counters(template, 1, 0, 0)
+
+        response = self.client.delete(f"/api/employees/employees/{employee.id}/")
+        self.assertEqual(response.status_code, 204)
+        self.assert_counters(template, 0, 0, 0)
+
+    def test_non_numeric_number_values_count_as_missing(self):
+        template = self.templates[0]
+        salary = FormField.objects.create(
+            form_template=template, field_type="NUMBER", label="Salary", order=1,
+        )
+        for value in ["abc", "", " 5 ", 7, True, "1-2"]:
+            Employee.objects.create(
+                form_template=template, created_by=self.user, data={str(salary.id): value}
+            )
+        salary.refresh_from_db()
+        self.assertEqual(salary.filled_count, 2)
+
+        output = StringIO()
+        call_command("reconcile_template_counters", template=template.id, stdout=output)
+        self.assertIn("0 had drifted", output.getvalue())
+
+        salary.field_type = "TEXT"
+        salary.save()
+        salary.refresh_from_db()
+        self.assertEqual(salary.filled_count, 5)
+
+    def test_reconcile_repairs_drifted_counters(self):
+        self.bulk_create()
+        FormTemplate.objects.filter(pk=self.templates[0].pk).update(
+            employee_count=10, active_employee_count=0
+        )
+        FormField.objects.filter(pk=self.fields[0].pk).update(filled_count=7)
+
+        output = StringIO()
+        call_command("reconcile_template_counters", stdout=output)
+
+        self.assertIn("Reconciled 2 templates; 1 had drifted", output.getvalue())
+        for template in self.templates:
+            self.assert_counters(template, 3, 2, 2)
+
+
+class AsyncReadViewTests(TestCase):
+    """
+    With ASYNC_READ_VIEWS the read actions are served by coroutines that
+    return the same responses as the sync views; other methods fall back
+    to the sync view.
+    """
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            username="owner", email="owner@example.com", password="password"
+        )
+        self.factory = APIRequestFactory()
+        self.template = FormTemplate.objects.create(name="Staff", created_by=self.user)
+        self.name = FormField.objects.create(
+            form_template=self.template, field_type="TEXT", label="Full Name", order=0,
+        )
+        self.employees = [
+            Employee.objects.create(
+                form_template=self.template,
+                created_by=self.user,
+                data={str(self.name.id): name},
+            )
+            for name in ["Ada Lovelace", "Grace Hopper"]
+        ]
+
+    def build_view(self, actions, asynchronous):
+        with override_settings(ASYNC_READ_VIEWS=asynchronous):
+            view = EmployeeViewSet.as_view(actions)
+        self.assertEqual(iscoroutinefunction(view), asynchronous)
+        return view
+
+    def call(self, view, path, method="get", data=None, user=None, **kwargs):
+        request = getattr(self.factory, method)(path, data, format="json")
+        force_authenticate(request, user=user or self.user)
+        if iscoroutinefunction(view):
+            return async_to_sync(view)(request, **kwargs)
+        return view(request, **kwargs)
+
+    def assert_same_response(self, actions, path, **kwargs):
+        responses = [
+            self.call(self.build_view(actions, asynchronous), path, **kwargs)
+            for asynchronous in (False, True)
+        ]
+        self.assertEqual(responses[1].status_code, responses[0].status_code)
+        self.assertEqual(responses[1].data, responses[0].data)
+        return responses[1]
+
+    def test_read_actions_match_sync_views(self):
+        response = self.assert_same_response({"get": "list"}, "/api/employees/employees/")
+        self.assertEqual(response.data["count"], 2)
+        self.assert_same_response(
+            {"get": "retrieve"}, "/", pk=str(self.employees[0].id)
+        )
+        response = self.assert_same_response(
+            {"get": "search"}, "/api/employees/employees/search/?q=hopper"
+        )
+        self.assertEqual([e["display_name"] for e in response.data], ["Grace Hopper"])
+        response = self.assert_same_response(
+            {"get": "by_template"},
+            f"/api/employees/employees/by_template/?template_id={self.template.id}&envelope=template",
+        )
+        self.assertEqual(len(response.data["templates"]), 1)
+
+    @override_settings(EMPLOYEE_EXPORT_CHUNK_SIZE=1)
+    def test_exports_stream_from_async_iterators(self):
+        for export_format, lines in [("csv", 3), ("ndjson", 2)]:
+            path = f"/?template_id={self.template.id}&export_format={export_format}"
+            sync_response = self.call(self.build_view({"get": "export"}, False), path)
+            response = self.call(self.build_view({"get": "export"}, True), path)
+
+            self.assertFalse(sync_response.is_async)
+            self.assertTrue(response.is_async)
+            content = async_to_sync(self.read_stream)(response)
+            self.assertEqual(content, b"".join(sync_response.streaming_content))
+            self.assertEqual(len(content.splitlines()), lines)
+
+    async def read_stream(self, response):
+        return b"".join([chunk async for chunk in response])
+
+    def test_other_users_employee_is_not_found(self):
+        other = CustomUser.objects.create_user(
+            username="other", email="other@example.com", password="password"
+        )
+        view = self.build_view({"get": "retrieve"}, True)
+        response = self.call(view, "/", user=other, pk=str(self.employees[0].id))
+        self.assertEqual(response.status_code, 404)
+
+    def test_conditional_get_answers_not_modified(self):
+        view = self.build_view({"get": "list"}, True)
+        response = self.call(view, "/api/employees/employees/")
+        request = self.factory.get("/api/employees/employees/", HTTP_IF_NONE_MATCH=response["ETag"])
+        force_authenticate(request, user=self.user)
+        self.assertEqual(async_to_sync(view)(request).status_code, 304)
+
+    def test_writes_fall_back_to_the_sync_view(self):
+        view = self.build_view({"get": "list", "post": "create"}, True)
+        response = self.call(
+            view,
+            "/api/employees/employees/",
+            method="post",
+            data={"form_template": self.template.id, "data": {str(self.name.id): "Alan Turing"}},
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(Employee.objects.count(), 3)
+
+
+class EmployeeBulkUpdateTests(TestCase):
+    """
+    ``bulk_update`` merges partial changes per employee, validates each
+    merged record, and reports a status for every requested id.
+    """
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            username="owner", email="owner@example.com", password="password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.template = FormTemplate.objects.create(name="Staff", created_by=self.user)
+        self.name = FormField.objects.create(
+            form_template=self.template, field_type="TEXT", label="Full Name",
+            is_required=True, order=0,
+        )
+        self.team = FormField.objects.create(
+            form_template=self.template, field_type="TEXT", label="Team", order=1,
+        )
+        self.employees = [
+            Employee.objects.create(
+                form_template=self.template,
+                created_by=self.user,
+                data={str(self.name.id): name, str(self.team.id): "Core"},
+            )
+            for name in ["Ada Lovelace", "Grace Hopper", "Alan Turing"]
+        ]
+
+    def bulk_update(self, payload, query=""):
+        return self.client.patch(
+            f"/api/employees/employees/bulk_update/{query}", payload, format="json"
+        )
+
+    def test_changes_by_id(self):
+        ada, grace, alan = self.employees
+        response = self.bulk_update([
+            {"id": ada.id, "data": {str(self.team.id): "Compilers"}},
+            {"id": grace.id, "data": {str(self.team.id): None}, "is_active": "false"},
+            {"id": alan.id, "data": {str(self.team.id): "Core"}},
+            {"id": 0, "data": {}},
+        ])
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            (response.data["updated_count"], response.data["unchanged_count"]), (2, 1)
+        )
+        self.assertEqual(
+            [result["status"] for result in response.data["results"]],
+            ["updated", "updated", "unchanged", "not_found"],
+        )
+        ada.refresh_from_db()
+        grace.refresh_from_db()
+        self.assertEqual(ada.data[str(self.team.id)], "Compilers")
+        self.assertEqual(ada.data[str(self.name.id)], "Ada Lovelace")
+        self.assertNotIn(str(self.team.id), grace.data)
+        self.assertFalse(grace.is_active)
+
+    def test_invalid_rows_are_reported_and_skipped(self):
+        ada, grace, _ = self.employees
+        response = self.bulk_update([
+            {"id": ada.id, "data": {str(self.name.id): None}},
+            {"id": grace.id, "is_active": "maybe"},
+        ])
+
+        self.assertEqual(response.data["error_count"], 2)
+        self.assertIn("data", response.data["results"][0]["errors"])
+        self.assertIn("is_active", response.data["results"][1]["errors"])
+        ada.refresh_from_db()
+        self.assertEqual(ada.data[str(self.name.id)], "Ada Lovelace")
+
+    def test_duplicate_ids_are_rejected(self):
+        ada = self.employees[0]
+        response = self.bulk_update([
+            {"id": ada.id, "is_active": False},
+            {"id": ada.id, "is_active": True},
+        ])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["errors"][0]["index"], 1)
+        ada.refresh_from_db()
+        self.assertTrue(ada.is_active)
+
+    def test_malformed_payloads_are_rejected(self):
+        for payload in [42, [], {"employees": "all"}, [{"data": {}}]]:
+            self.assertEqual(self.bulk_update(payload).status_code, 400, payload)
+
+    def test_change_by_filter(self):
+        response = self.bulk_update({"is_active": False})
+        self.assertEqual(response.status_code, 400)
+
+        response = self.bulk_update(
+            {"is_active": 0}, f"?form_template={self.template.id}"
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.data["updated_count"], 3)
+        self.assertFalse(Employee.objects.filter(is_active=True).exists())
+
+
+@mock.patch.object(DefaultPagination, "page_size", 2)
+class EmployeeKeysetPaginationTests(TestCase):
+    """
+    ``?pagination=cursor`` walks the list by ``(timestamp, id)`` in both
+    directions, without skipping or repeating rows that share a timestamp.
+    """
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            username="owner", email="owner@example.com", password="password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        template = FormTemplate.objects.create(name="Staff", created_by=self.user)
+        employees = [
+            Employee.objects.create(form_template=template, created_by=self.user, data={})
+            for _ in range(5)
+        ]
+        self.ids = [employee.id for employee in employees]
+        # Every row shares one created_at, so only the id orders them.
+        Employee.objects.update(created_at=timezone.now())
+
+    def get_page(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return [employee["id"] for employee in response.data["results"]], response.data
+
+    def test_walks_forward_and_back_through_ties(self):
+        pages = []
+        url = "/api/employees/employees/?pagination=cursor"
+        while url:
+            ids, data = self.get_page(url)
+            pages.append((ids, data))
+            url = data["next"]
+
+        newest_first = self.ids[::-1]
+        self.assertEqual(
+            [ids for ids, _ in pages], [newest_first[:2], newest_first[2:4], newest_first[4:]]
+        )
+        self.assertIsNone(pages[0][1]["previous"])
+
+        ids, data = self.get_page(pages[2][1]["previous"])
+        self.assertEqual(ids, pages[1][0])
+        ids, data = self.get_page(data["previous"])
+        self.assertEqual(ids, pages[0][0])
+        self.assertIsNone(data["previous"])
+        self.assertEqual(self.get_page(data["next"])[0], pages[1][0])
+
+    def test_ascending_ordering(self):
+        ids, data = self.get_page("/api/employees/employees/?pagination=cursor&ordering=created_at")
+        self.assertEqual(ids, self.ids[:2])
+        self.assertEqual(self.get_page(data["next"])[0], self.ids[2:4])
+
+    def test_invalid_cursor_and_ordering(self):
+        for cursor in ["not-a-cursor", "WyItY3JlYXRlZF9hdCJd"]:
+            response = self.client.get(f"/api/employees/employees/?cursor={cursor}")
+            self.assertEqual(response.status_code, 404, cursor)
+
+        _, data = self.get_page("/api/employees/employees/?pagination=cursor")
+        response = self.client.get(data["next"] + "&ordering=updated_at")
+        self.assertEqual(response.status_code, 404)
+
+        response = self.client.get("/api/employees/employees/?pagination=cursor&ordering=id")
+        self.assertEqual(response.status_code, 400)
+
+
+class EmployeeImportTests(TestCase):
+    """
+    Imports map headers to fields and drop only the rows that fail.
+    """
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            username="owner", email="owner@example.com", password="password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.template = FormTemplate.objects.create(name="Staff", created_by=self.user)
+        self.name = FormField.objects.create(
+            form_template=self.template, label="Name", field_type="TEXT", is_required=True, order=0
+        )
+        self.age = FormField.objects.create(
+            form_template=self.template, label="Age", field_type="NUMBER", order=1
+        )
+
+    def import_file(self, name, content, **extra):
+        return self.client.post(
+            "/api/employees/employees/import/",
+            {
+                "file": SimpleUploadedFile(name, content.encode()),
+                "template_id": self.template.id,
+                "batch_size": 2,
+                **extra,
+            },
+            format="multipart",
+        )
+
+    def imported_data(self):
+        return list(Employee.objects.order_by("id").values_list("data", flat=True))
+
+    def test_csv_headers_map_by_label_or_id(self):
+        response = self.import_file(
+            "staff.csv",
+            f" name ,{self.age.id},Notes\nAda,36,x\nGrace,,y\n",
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.data["created_count"], 2)
+        self.assertEqual(response.data["ignored_columns"], ["Notes"])
+        self.assertEqual(self.imported_data(), [
+            {str(self.name.id): "Ada", str(self.age.id): "36"},
+            {str(self.name.id): "Grace"},
+        ])
+
+    def test_csv_rows_fail_independently(self):
+        response = self.import_file(
+            "staff.csv",
+            "Name,Age\nAda,36\nBob,old\n,40\n\nGrace,85\n",
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.data["total_rows"], 4)
+        self.assertEqual(response.data["created_count"], 2)
+        self.assertEqual(response.data["error_count"], 2)
+        self.assertEqual([error["line"] for error in response.data["errors"]], [3, 4])
+        self.assertEqual(
+            [data[str(self.name.id)] for data in self.imported_data()], ["Ada", "Grace"]
+        )
+
+    def test_ndjson_rows_fail_independently(self):
+        content = "\n".join([
+            '{"Name": "Ada", "age": 36}',
+            "not json",
+            '["Bob"]',
+            f'{{"data": {{"{self.name.id}": "Grace", "Team": "Navy"}}}}',
+            '{"Age": 40}',
+        ])
+        response = self.import_file("staff.txt", content, import_format="ndjson")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.data["created_count"], 2)
+        self.assertEqual(response.data["ignored_columns"], ["Team"])
+        self.assertEqual(
+            [error["line"] for error in response.data["errors"]], [2, 3, 5]
+        )
+        self.assertEqual(self.imported_data(), [
+            {str(self.name.id): "Ada", str(self.age.id): 36},
+            {str(self.name.id): "Grace"},
+        ])
+
+    def test_unknown_format_is_rejected(self):
+        response = self.import_file("staff.csv", "Name\nAda\n", import_format="xlsx")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Employee.objects.exists())
+
+
+class EmployeeExportTests(TestCase):
+    """
+    Exports are streamed row by row as CSV or NDJSON.
+    """
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            username="owner", email="owner@example.com", password="password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.template = FormTemplate.objects.create(name="Staff", created_by=self.user)
+        self.skills = FormField.objects.create(
+            form_template=self.template, label="Skills", field_type="TEXT", order=1
+        )
+        self.name = FormField.objects.create(
+            form_template=self.template, label="Name", field_type="TEXT", order=0
+        )
+        self.ada = Employee.objects.create(
+            form_template=self.template,
+            created_by=self.user,
+            data={str(self.name.id): "Ada, Countess", str(self.skills.id): ["math", "code"]},
+        )
+        self.bob = Employee.objects.create(
+            form_template=self.template,
+            created_by=self.user,
+            data={str(self.name.id): "Bob"},
+            is_active=False,
+        )
+
+    def export(self, export_format, **params):
+        response = self.client.get(
+            "/api/employees/employees/export/",
+            {"template_id": self.template.id, "export_format": export_format, **params},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response
+
+    def read(self, response, after_first_chunk=None):
+        """
+        Collect the streamed chunks of a sync or async view, calling
+        ``after_first_chunk`` once the first one has been sent.
+        """
+        chunks = []
+
+        def receive(chunk):
+            chunks.append(chunk)
+            return after_first_chunk if len(chunks) == 1 else None
+
+        if response.is_async:
+            async def collect():
+                async for chunk in response.streaming_content:
+                    callback = receive(chunk)
+                    if callback:
+                        await sync_to_async(callback)()
+            async_to_sync(collect)()
+        else:
+            for chunk in response.streaming_content:
+                callback = receive(chunk)
+                if callback:
+                    callback()
+        return b"".join(chunks).decode()
+
+    def test_csv_has_one_column_per_field_in_order(self):
+        response = self.export("csv")
+        self.assertEqual(response["Content-Type"], "text/csv")
+        rows = list(csv.reader(StringIO(self.read(response))))
+        self.assertEqual(rows[0], ["ID", "Name", "Skills", "Active", "Created At", "Updated At"])
+        self.assertEqual(
+            [row[:4] for row in rows[1:]],
+            [
+                [str(self.ada.id), "Ada, Countess", '["math", "code"]', "True"],
+                [str(self.bob.id), "Bob", "", "False"],
+            ],
+        )
+
+    def test_ndjson_has_one_document_per_employee(self):
+        response = self.export("ndjson", is_active="true")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = self.read(response).splitlines()
+        self.assertEqual(len(lines), 1)
+        document = json.loads(lines[0])
+        self.assertEqual(document["id"], self.ada.id)
+        self.assertEqual(document["data"], self.ada.data)
+        self.assertTrue(document["is_active"])
+
+    @override_settings(EMPLOYEE_EXPORT_CHUNK_SIZE=1)
+    def test_rows_are_read_while_streaming(self):
+        def create_employee():
+            Employee.objects.create(form_template=self.template, created_by=self.user, data={})
+
+        # Created after the header went out, yet still exported.
+        content = self.read(self.export("csv"), after_first_chunk=create_employee)
+        self.assertEqual(len(content.splitlines()), 4)
+
+    def test_invalid_requests(self):
+        response = self.client.get(
+            "/api/employees/employees/export/",
+            {"template_id": self.template.id, "export_format": "xlsx"},
+        )
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get("/api/employees/employees/export/", {"template_id": "x"})
+        self.assertEqual(response.status_code, 404)
+
+
+class EmployeeProjectionTests(TestCase):
+    """
+    ``?fields=`` and ``?data_fields=`` trim both the response and the query.
+    """
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            username="owner", email="owner@example.com", password="password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.template = FormTemplate.objects.create(name="Staff", created_by=self.user)
+        self.name = FormField.objects.create(
+            form_template=self.template, label="Name", field_type="TEXT", order=0
+        )
+        self.team = FormField.objects.create(
+            form_template=self.template, label="Team", field_type="TEXT", order=1
+        )
+        self.employee = Employee.objects.create(
+            form_template=self.template,
+            created_by=self.user,
+            data={str(self.name.id): "Ada", str(self.team.id): "Research"},
+        )
+
+    def get(self, path):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200, response.content)
+        employee_query = next(
+            query["sql"] for query in queries.captured_queries
+            if query["sql"].startswith('SELECT "employees_employee"."id"')
+        )
+        return response.data, employee_query
+
+    def assertDataColumnNotSelected(self, sql):
+        # The column may still appear inside the per-key JSON expressions.
+        self.assertIsNone(re.search(r'(SELECT|,) "employees_employee"\."data"(,| FROM)', sql), sql)
+
+    def test_fields_limit_attributes_and_columns(self):
+        data, sql = self.get("/api/employees/employees/?fields=id,display_name,unknown")
+        self.assertEqual(data["results"], [{"id": self.employee.id, "display_name": "Ada"}])
+        self.assertDataColumnNotSelected(sql)
+        self.assertNotIn("forms_formtemplate", sql)
+
+    def test_data_fields_select_only_requested_keys(self):
+        data, sql = self.get(
+            f"/api/employees/employees/{self.employee.id}/?fields=id,data&data_fields={self.team.id}"
+        )
+        self.assertEqual(data, {"id": self.employee.id, "data": {str(self.team.id): "Research"}})
+        self.assertDataColumnNotSelected(sql)
+
+    def test_data_fields_skip_missing_keys(self):
+        data, _ = self.get(f"/api/employees/employees/?data_fields={self.name.id},999")
+        self.assertEqual(data["results"][0]["data"], {str(self.name.id): "Ada"})
+        self.assertEqual(data["results"][0]["form_template_name"], "Staff")
+
+
+class EmployeeTemplateEnvelopeTests(TestCase):
+    """
+    ``?envelope=template`` serializes each template schema once per page.
+    """
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            username="owner", email="owner@example.com", password="password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.staff = FormTemplate.objects.create(name="Staff", created_by=self.user)
+        self.contractors = FormTemplate.objects.create(name="Contractors", created_by=self.user)
+        self.fields = {
+            template.id: FormField.objects.create(
+                form_template=template, label="Name", field_type="TEXT", order=0
+            )
+            for template in (self.staff, self.contractors)
+        }
+        for template, name in [
+            (self.staff, "Ada"), (self.staff, "Alan"), (self.contractors, "Anita"),
+        ]:
+            Employee.objects.create(
+                form_template=template,
+                created_by=self.user,
+                data={str(self.fields[template.id].id): name},
+            )
+
+    def get(self, path):
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response
+
+    def test_by_template_envelope(self):
+        data = self.get(
+            f"/api/employees/employees/by_template/?template_id={self.staff.id}&envelope=template"
+        ).data
+        self.assertEqual(set(data), {"count", "next", "previous", "templates", "results"})
+        self.assertEqual(data["count"], 2)
+        self.assertEqual(len(data["templates"]), 1)
+        template = data["templates"][0]
+        self.assertEqual((template["id"], template["name"]), (self.staff.id, "Staff"))
+        self.assertEqual(
+            [field["id"] for field in template["fields"]], [self.fields[self.staff.id].id]
+        )
+        self.assertEqual(
+            {employee["schema_version"] for employee in data["results"]},
+            {template["schema_version"]},
+        )
+        for employee in data["results"]:
+            self.assertNotIn("template_fields", employee)
+            self.assertNotIn("form_template_name", employee)
+
+    def test_search_envelope_lists_each_template_once(self):
+        data = self.get("/api/employees/employees/search/?q=A&envelope=template").data
+        self.assertEqual(len(data["results"]), 3)
+        self.assertEqual(
+            sorted(template["id"] for template in data["templates"]),
+            [self.staff.id, self.contractors.id],
+        )
+
+    @override_settings(EMPLOYEE_COLLECTION_MAX_RESULTS=1)
+    def test_without_envelope_the_list_is_capped(self):
+        response = self.get(f"/api/employees/employees/by_template/?template_id={self.staff.id}")
+        self.assertEqual(len(response.data), 1)
+        self.assertIn("template_fields", response.data[0])
+        self.assertEqual(response["X-Results-Truncated"], "true")
+
+
+@override_settings(DATABASE_ROUTERS=["employee_management.routers.PrimaryReplicaRouter"])
+class PrimaryReplicaRouterTests(TestCase):
+    """
+    Reads go to the replica unless a transaction is open on the primary;
+    writes and locking reads always use the primary.
+    """
+
+    def test_reads_use_the_replica_outside_transactions(self):
+        # TestCase wraps each test in a transaction, so leave it for this check.
+        with mock.patch.object(connection, "in_atomic_block", False):
+            self.assertEqual(Employee.objects.all().db, "replica")
+            self.assertEqual(FormTemplate.objects.filter(name="Staff").db, "replica")
+            self.assertEqual(Employee.objects.select_for_update().db, "default")
+
+    def test_reads_stay_on_the_primary_inside_transactions(self):
+        self.assertTrue(connection.in_atomic_block)
+        self.assertEqual(Employee.objects.all().db, "default")
+
+    def test_writes_and_migrations_use_the_primary(self):
+        with mock.patch.object(connection, "in_atomic_block", False):
+            user = CustomUser.objects.create_user(
+                username="owner", email="owner@example.com", password="password"
+            )
+            template = FormTemplate.objects.create(name="Staff", created_by=user)
+        self.assertEqual(user._state.db, "default")
+        self.assertEqual(template._state.db, "default")
+        self.assertTrue(router.allow_migrate("default", "employees"))
+        self.assertFalse(router.allow_migrate("replica", "employees"))
@@ -1,9 +1,10 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from apps.employees.views import EmployeeViewSet
+from apps.employees.views import EmployeeViewSet, EmployeePurgeJobViewSet
 
 router = DefaultRouter()
 router.register(r"employees", EmployeeViewSet, basename="employee")
+router.register(r"purge-jobs", EmployeePurgeJobViewSet, basename="employee-purge-job")
 
 urlpatterns = [
     path("", include(router.urls)),
@@ -1,32 +1,98 @@
+import time
+from asgiref.sync import sync_to_async
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
-from .models import Employee
+from django.conf import settings
+from django.db.models import Count, Max
+from django.http import StreamingHttpResponse
+from .analytics import (
+    DATE_BUCKETS,
+    DEFAULT_HISTOGRAM_BUCKETS,
+    MAX_HISTOGRAM_BUCKETS,
+    template_analytics,
+)
+from .bulk import (
+    build_employees,
+    delete_employees,
+    get_chunk_size,
+    insert_employees,
+    parse_id,
+    throughput,
+    update_employees,
+)
+from .filters import EmployeeFieldFilter, EmployeeSearchFilter
+from .exports import EXPORT_FORMATS, aiter_csv, aiter_ndjson, iter_csv, iter_ndjson
+from .imports import IMPORT_FORMATS, detect_format, import_employees
+from .models import Employee, EmployeePurgeJob
+from .projection import parse_list, project_queryset
+from .purge import soft_delete
+from .search import get_search_backend, search_employees
 from .serializers import (
     EmployeeSerializer,
     EmployeeCreateSerializer,
     EmployeeListSerializer,
-    EmployeeUpdateSerializer
+    EmployeePurgeJobSerializer,
+    EmployeeTemplateSchemaSerializer,
+    EmployeeUpdateSerializer,
+    EmployeeValuesSerializer
 )
 from apps.forms.models import FormTemplate
+from apps.forms.versions import get_schema_version
+from employee_management.asynchronous import AsyncReadMixin
+from employee_management.conditional import ConditionalGetMixin
 
 
-class EmployeeViewSet(viewsets.ModelViewSet):
+class EmployeeViewSet(AsyncReadMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    search_fields = ['data', 'form_template__name']
+    async_actions = ('list', 'retrieve', 'search', 'by_template', 'export')
+    filter_backends = [DjangoFilterBackend, EmployeeFieldFilter, EmployeeSearchFilter, OrderingFilter]
     filterset_fields = ['form_template', 'is_active']
-    ordering_fields = ['created_at', 'updated_at']
+    ordering_fields = ['created_at', 'updated_at', 'display_name']
     ordering = ['-created_at']
 
     def get_queryset(self):
-        return Employee.objects.filter(
+        queryset = Employee.objects.filter(
             created_by=self.request.user
-        ).select_related('form_template', 'form_template__created_by').prefetch_related('form_template__fields')
+        ).select_related('form_template')
+
+        if self.request.method != 'GET':
+            return queryset
+
+        fields = parse_list(self.request.query_params.get('fields'))
+        if fields and self.uses_template_envelope():
+            fields.append('form_template')
+        if 'template_fields' in (fields or self.get_serializer_class()._declared_fields):
+            queryset = queryset.prefetch_related('form_template__fields')
+
+        return project_queryset(
+            queryset,
+            fields,
+            parse_list(self.request.query_params.get('data_fields')),
+        )
+
+    def get_cache_validators(self):
+        user = self.request.user
+        if self.action == 'retrieve':
+            employee_id = parse_id(self.kwargs.get('pk'))
+            row = Employee.objects.filter(
+                pk=employee_id, created_by=user
+            ).values_list('updated_at', 'form_template__updated_at').first()
+            return (row, max(row)) if row else None
+
+        employees = Employee.objects.filter(created_by=user).aggregate(
+            last_modified=Max('updated_at'), count=Count('id')
+        )
+        templates_modified = FormTemplate.objects.filter(created_by=user).aggregate(
+            last_modified=Max('updated_at')
+        )['last_modified']
+        state = (employees['count'], employees['last_modified'], templates_modified)
+        # No Last-Modified: deleting a row leaves max(updated_at) unchanged,
+        # so If-Modified-Since would answer 304 with a stale list.
+        return state, None
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -35,6 +101,8 @@ class EmployeeViewSet(viewsets.ModelViewSet):
             return EmployeeListSerializer
         elif self.action in ['update', 'partial_update']:
             return EmployeeUpdateSerializer
+        elif self.uses_template_envelope():
+            return EmployeeValuesSerializer
         return EmployeeSerializer
 
     def perform_create(self, serializer):
@@ -66,8 +134,187 @@ class EmployeeViewSet(viewsets.ModelViewSet):
             )
         
         employees = self.get_queryset().filter(form_template=template)
-        serializer = self.get_serializer(employees, many=True)
-        return Response(serializer.data)
+        return self.collection_response(employees)
+
+    async def aby_template(self, request):
+        template_id = request.query_params.get('template_id')
+        if not template_id:
+            return Response(
+                {'error': 'template_id parameter is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            template = await FormTemplate.objects.aget(
+                id=template_id,
+                created_by=request.user
+            )
+        except FormTemplate.DoesNotExist:
+            return Response(
+                {'error': 'Form template not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        employees = self.get_queryset().filter(form_template=template)
+        return await self.acollection_response(employees)
+
+    @action(detail=False, methods=['get'])
+    def analytics(self, request):
+        template_id = request.query_params.get('template_id')
+        if not template_id:
+            return Response(
+                {'error': 'template_id parameter is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            template = FormTemplate.objects.get(
+                id=template_id,
+                created_by=request.user
+            )
+        except (FormTemplate.DoesNotExist, ValueError):
+            return Response(
+                {'error': 'Form template not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        date_bucket = request.query_params.get('date_bucket', 'month')
+        if date_bucket not in DATE_BUCKETS:
+            return Response(
+                {'error': f"date_bucket must be one of: {', '.join(DATE_BUCKETS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        buckets = parse_id(request.query_params.get('buckets')) or DEFAULT_HISTOGRAM_BUCKETS
+        buckets = max(1, min(buckets, MAX_HISTOGRAM_BUCKETS))
+
+        queryset = Employee.objects.filter(
+            created_by=request.user,
+            form_template=template
+        )
+        is_active = request.query_params.get('is_active')
+        if is_active is not None:
+            queryset = queryset.filter(is_active=is_active.lower() in ['true', '1'])
+
+        fields = template.fields.order_by('order', 'id')
+        if 'field_ids' in request.query_params:
+            field_ids = [parse_id(value) for value in parse_list(request.query_params['field_ids'])]
+            fields = fields.filter(id__in=field_ids)
+
+        return Response({
+            'template': {'id': template.id, 'name': template.name},
+            **template_analytics(queryset, fields, buckets, date_bucket),
+        })
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        export = self.prepare_export(request)
+        if isinstance(export, Response):
+            return export
+        template, export_format, fields, queryset = export
+
+        if export_format == 'csv':
+            rows = iter_csv(fields, queryset)
+        else:
+            rows = iter_ndjson(queryset)
+        return self.export_response(template, export_format, rows)
+
+    async def aexport(self, request):
+        export = await sync_to_async(self.prepare_export)(request)
+        if isinstance(export, Response):
+            return export
+        template, export_format, fields, queryset = export
+
+        # Under ASGI a sync iterator would be collected into memory first.
+        if export_format == 'csv':
+            rows = aiter_csv(fields, queryset)
+        else:
+            rows = aiter_ndjson(queryset)
+        return self.export_response(template, export_format, rows)
+
+    def prepare_export(self, request):
+        template_id = request.query_params.get('template_id')
+        export_format = request.query_params.get('export_format', 'csv').lower()
+
+        if not template_id:
+            return Response(
+                {'error': 'template_id parameter is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {'error': f"export_format must be one of: {', '.join(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            template = FormTemplate.objects.get(
+                id=template_id,
+                created_by=request.user
+            )
+        except (FormTemplate.DoesNotExist, ValueError):
+            return Response(
+                {'error': 'Form template not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        queryset = Employee.objects.filter(
+            created_by=request.user,
+            form_template=template
+        )
+        is_active = request.query_params.get('is_active')
+        if is_active is not None:
+            queryset = queryset.filter(is_active=is_active.lower() in ['true', '1'])
+
+        fields = None
+        if export_format == 'csv':
+            fields = list(template.fields.order_by('order', 'id'))
+        return template, export_format, fields, queryset
+
+    def export_response(self, template, export_format, rows):
+        response = StreamingHttpResponse(rows, content_type=EXPORT_FORMATS[export_format])
+        response['Content-Disposition'] = (
+            f'attachment; filename="employees-{template.id}.{export_format}"'
+        )
+        return response
+
+    @action(detail=False, methods=['post'], url_path='import')
+    def import_file(self, request):
+        upload = request.FILES.get('file')
+        template_id = request.data.get('template_id')
+
+        if not upload or not template_id:
+            return Response(
+                {'error': 'file and template_id are required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        import_format = detect_format(upload, request.data.get('import_format'))
+        if import_format not in IMPORT_FORMATS:
+            return Response(
+                {'error': f"import_format must be one of: {', '.join(IMPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            template = FormTemplate.objects.get(
+                id=template_id,
+                created_by=request.user
+            )
+        except (FormTemplate.DoesNotExist, ValueError):
+            return Response(
+                {'error': 'Form template not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        summary = import_employees(
+            upload,
+            template,
+            request.user,
+            import_format,
+            get_chunk_size(request.data.get('batch_size')),
+        )
+        return Response(summary)
 
     @action(detail=False, methods=['get'])
     def search(self, request):
@@ -80,13 +327,86 @@ class EmployeeViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(form_template_id=template_id)
         
         if query:
-            queryset = queryset.filter(
-                Q(form_template__name__icontains=query) |
-                Q(data__icontains=query)
+            queryset = search_employees(queryset, query)
+
+        return self.collection_response(queryset)
+
+    async def asearch(self, request):
+        query = request.query_params.get('q', '')
+        template_id = request.query_params.get('template_id')
+
+        queryset = self.get_queryset()
+
+        if template_id:
+            queryset = queryset.filter(form_template_id=template_id)
+
+        if query:
+            queryset = await sync_to_async(search_employees)(queryset, query)
+
+        return await self.acollection_response(queryset)
+
+    def uses_template_envelope(self):
+        return (
+            self.action in ['by_template', 'search']
+            and self.request.query_params.get('envelope') == 'template'
+        )
+
+    def collection_response(self, queryset):
+        """
+        Response for the unpaginated-by-default collection actions.
+
+        With ``?envelope=template`` the page is returned as
+        ``{count, next, previous, templates, results}``: each template schema
+        appears once and employees carry only their values. Otherwise the
+        legacy list shape is kept but capped at EMPLOYEE_COLLECTION_MAX_RESULTS.
+        """
+        if not self.uses_template_envelope():
+            limit = getattr(settings, 'EMPLOYEE_COLLECTION_MAX_RESULTS', 1000)
+            return self.truncated_response(list(queryset[:limit + 1]), limit)
+
+        page = self.paginate_queryset(queryset)
+        employees = list(queryset) if page is None else page
+        templates = list(self.envelope_templates(employees))
+        for template in templates:
+            get_schema_version(template)
+        return self.envelope_response(page, employees, templates)
+
+    async def acollection_response(self, queryset):
+        if not self.uses_template_envelope():
+            limit = getattr(settings, 'EMPLOYEE_COLLECTION_MAX_RESULTS', 1000)
+            return self.truncated_response(
+                [employee async for employee in queryset[:limit + 1]], limit
             )
-        
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+
+        page = await self.apaginate_queryset(queryset)
+        employees = [employee async for employee in queryset] if page is None else page
+        templates = [template async for template in self.envelope_templates(employees)]
+        for template in templates:
+            if template.schema_version_id is None:
+                await sync_to_async(get_schema_version)(template)
+        return self.envelope_response(page, employees, templates)
+
+    def truncated_response(self, employees, limit):
+        serializer = self.get_serializer(employees[:limit], many=True)
+        response = Response(serializer.data)
+        if len(employees) > limit:
+            response['X-Results-Truncated'] = 'true'
+        return response
+
+    def envelope_templates(self, employees):
+        return FormTemplate.objects.filter(
+            id__in={employee.form_template_id for employee in employees}
+        ).select_related('schema_version')
+
+    def envelope_response(self, page, employees, templates):
+        results = self.get_serializer(employees, many=True).data
+        schemas = EmployeeTemplateSchemaSerializer(templates, many=True).data
+
+        if page is None:
+            return Response({'templates': schemas, 'results': results})
+        response = self.get_paginated_response(results)
+        response.data['templates'] = schemas
+        return response
 
     @action(detail=True, methods=['post'])
     def validate_data(self, request, pk=None):
@@ -104,6 +424,137 @@ class EmployeeViewSet(viewsets.ModelViewSet):
             'message': 'Employee data is valid'
         })
 
+    @action(detail=False, methods=['post'])
+    def bulk_create(self, request):
+        rows = request.data
+        chunk_size = request.query_params.get('chunk_size')
+        if isinstance(rows, dict):
+            chunk_size = rows.get('chunk_size', chunk_size)
+            rows = rows.get('employees')
+
+        if not isinstance(rows, list) or not rows:
+            return Response(
+                {'error': 'A non-empty list of employees is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        max_rows = getattr(settings, 'EMPLOYEE_BULK_MAX_ROWS', 5000)
+        if len(rows) > max_rows:
+            return Response(
+                {'error': f'At most {max_rows} employees can be created per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        started_at = time.perf_counter()
+        employees, errors = build_employees(rows, request.user)
+
+        if errors:
+            return Response({
+                'created_count': 0,
+                'error_count': len(errors),
+                'errors': errors,
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        created = insert_employees(employees, get_chunk_size(chunk_size))
+
+        return Response({
+            'message': f'Successfully created {len(created)} employees',
+            'created_count': len(created),
+            'employee_ids': [employee.id for employee in created],
+            'errors': [],
+            **throughput(len(created), started_at),
+        }, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['patch'])
+    def bulk_update(self, request):
+        """
+        Apply partial changes to many employees.
+
+        Either send a list of ``{id, data, is_active}`` changes, or a single
+        ``{data, is_active}`` change applied to every employee matching the
+        list filters in the query string (``form_template`` is required).
+        """
+        payload = request.data
+        chunk_size = get_chunk_size(request.query_params.get('chunk_size'))
+        max_rows = getattr(settings, 'EMPLOYEE_BULK_MAX_ROWS', 5000)
+        started_at = time.perf_counter()
+
+        if not isinstance(payload, (list, dict)):
+            return Response(
+                {'error': 'Expected a list of employee changes or an object'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if isinstance(payload, list) or 'employees' in payload:
+            rows = payload if isinstance(payload, list) else payload.get('employees')
+            if not isinstance(rows, list) or not rows:
+                return Response(
+                    {'error': 'A non-empty list of employee changes is required'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if len(rows) > max_rows:
+                return Response(
+                    {'error': f'At most {max_rows} employees can be updated per request'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            changes = {}
+            errors = []
+            for index, row in enumerate(rows):
+                employee_id = parse_id(row.get('id')) if isinstance(row, dict) else None
+                if employee_id is None:
+                    return Response(
+                        {'error': 'Each change must be an object with an id'},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+                if employee_id in changes:
+                    errors.append({'index': index, 'errors': {'id': ['Duplicate employee id']}})
+                changes[employee_id] = row
+
+            if errors:
+                return Response({
+                    'updated_count': 0,
+                    'error_count': len(errors),
+                    'errors': errors,
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+            summary, results = update_employees(
+                self.get_queryset().filter(id__in=changes),
+                lambda employee: changes[employee.id],
+                chunk_size,
+            )
+            found = {result['id'] for result in results}
+            results += [
+                {'id': employee_id, 'status': 'not_found'}
+                for employee_id in changes if employee_id not in found
+            ]
+        else:
+            if 'form_template' not in request.query_params:
+                return Response(
+                    {'error': 'form_template parameter is required when updating by filter'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            change = {key: payload[key] for key in ('data', 'is_active') if key in payload}
+            if not change:
+                return Response(
+                    {'error': 'data or is_active is required'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            summary, results = update_employees(
+                self.filter_queryset(self.get_queryset()),
+                lambda employee: change,
+                chunk_size,
+            )
+            results = [result for result in results if result['status'] == 'error']
+
+        return Response({
+            'message': f"Successfully updated {summary['updated_count']} employees",
+            **summary,
+            'results': results,
+            **throughput(summary['matched_count'], started_at),
+        })
+
     @action(detail=False, methods=['delete'])
     def bulk_delete(self, request):
         employee_ids = request.data.get('employee_ids', [])
@@ -114,8 +565,17 @@ class EmployeeViewSet(viewsets.ModelViewSet):
             )
         
         employees = self.get_queryset().filter(id__in=employee_ids)
-        deleted_count = employees.count()
-        employees.delete()
+
+        if request.data.get('mode', request.query_params.get('mode')) == 'soft':
+            job = soft_delete(employees, request.user)
+            return Response({
+                'message': f'Deactivated {job.total_count} employees; purge scheduled',
+                'deleted_count': 0,
+                'deactivated_count': job.total_count,
+                'job': EmployeePurgeJobSerializer(job).data,
+            }, status=status.HTTP_202_ACCEPTED)
+
+        deleted_count = delete_employees(employees)
         
         return Response({
             'message': f'Successfully deleted {deleted_count} employees',
@@ -123,21 +583,36 @@ class EmployeeViewSet(viewsets.ModelViewSet):
         })
 
     def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        
-        search_query = request.query_params.get('search')
-        
-        if search_query:
-            queryset = queryset.filter(
-                Q(form_template__name__icontains=search_query) |
-                Q(data__icontains=search_query)
-            )
-        
+        queryset = self.rank_queryset(self.filter_queryset(self.get_queryset()))
+
         page = self.paginate_queryset(queryset)
-        
+
         if page is not None:
             serializer = self.get_serializer(page, many=True)
             return self.get_paginated_response(serializer.data)
 
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = await self.afilter_queryset(self.get_queryset())
+        # The search backend is probed from the database on first use.
+        queryset = await sync_to_async(self.rank_queryset)(queryset)
+        return await self.alist_response(queryset)
+
+    def rank_queryset(self, queryset):
+        search_query = self.request.query_params.get('search')
+
+        if search_query and 'ordering' not in self.request.query_params:
+            queryset = get_search_backend().rank(queryset)
+        return queryset
+
+
+class EmployeePurgeJobViewSet(viewsets.ReadOnlyModelViewSet):
+    serializer_class = EmployeePurgeJobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return EmployeePurgeJob.objects.filter(
+            created_by=self.request.user
+        ).defer('employee_ids')
@@ -0,0 +1,100 @@
+from django.db import transaction
+from django.db.models import Value
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from .models import FormField, FormTemplate
+from .signals import fields_reordered
+from .versions import SCHEMA_ATTRIBUTES
+
+
+def create_templates(items, user):
+    """
+    Insert already validated ``{name, description, fields}`` items.
+
+    Templates and fields are written with one ``bulk_create`` each, skipping
+    the per-field ``full_clean`` of ``FormField.save``; the serializer has
+    already checked everything it would. Returns the created templates.
+    """
+    with transaction.atomic():
+        templates = FormTemplate.objects.bulk_create([
+            FormTemplate(
+                name=item["name"],
+                description=item.get("description"),
+                created_by=user,
+            )
+            for item in items
+        ])
+        FormField.objects.bulk_create([
+            FormField(form_template=template, **{**field, "order": order})
+            for template, item in zip(templates, items)
+            for order, field in enumerate(item["fields"])
+        ])
+    return templates
+
+
+def copy_name(name, user):
+    """
+    First free ``"<name> (copy)"`` / ``"<name> (copy N)"`` for ``user``.
+    """
+    base = f"{name} (copy"
+    # The database folds the base (its LOWER may differ from str.lower());
+    # the ASCII suffixes after it compare the same either way.
+    taken = {
+        name_lower[len(base):]
+        for name_lower in FormTemplate.objects.annotate(name_lower=Lower("name"))
+        .filter(created_by=user, name_lower__startswith=Lower(Value(base)))
+        .values_list("name_lower", flat=True)
+    }
+    suffix, number = ")", 1
+    while suffix.lower() in taken:
+        number += 1
+        suffix = f" {number})"
+    return base + suffix
+
+
+def clone_template(template, user, name=None):
+    """
+    Copy ``template`` and its fields for ``user`` in a constant number of queries.
+    """
+    fields = [
+        {attribute: getattr(field, attribute) for attribute in SCHEMA_ATTRIBUTES if attribute != "id"}
+        for field in template.fields.order_by("order", "id")
+    ]
+    item = {
+        "name": name or copy_name(template.name, user),
+        "description": template.description,
+        "fields": fields,
+    }
+    return create_templates([item], user)[0]
+
+
+def reorder_fields(fields, field_ids):
+    """
+    Give ``fields`` (all fields of one template) the order of ``field_ids``.
+
+    Only the fields that actually move are written, with one ``bulk_update``
+    in a single transaction. Returns the moved fields.
+    """
+    by_id = {field.id: field for field in fields}
+    now = timezone.now()
+    moved = []
+    for order, field_id in enumerate(field_ids):
+        field = by_id[field_id]
+        if field.order != order:
+            field.order = order
+            field.updated_at = now
+            moved.append(field)
+
+    if moved:
+        template_id = moved[0].form_template_id
+        with transaction.atomic():
+            FormField.objects.bulk_update(moved, ["order", "updated_at"])
+            # Order is part of the schema, so it needs a new version.
+            FormTemplate.objects.filter(pk=template_id).update(
+                schema_version=None, updated_at=now
+            )
+            fields_reordered.send(
+                sender=FormField, form_template_id=template_id, fields=moved
+            )
+    return moved
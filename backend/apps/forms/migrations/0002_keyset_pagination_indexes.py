@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-17 05:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forms', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='formtemplate',
+            index=models.Index(fields=['created_by', '-created_at', '-id'], name='template_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='formtemplate',
+            index=models.Index(fields=['created_by', '-updated_at', '-id'], name='template_user_updated_idx'),
+        ),
+    ]
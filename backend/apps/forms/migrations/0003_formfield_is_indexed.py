@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-17 05:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forms', '0002_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='formfield',
+            name='is_indexed',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-17 06:00
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forms', '0003_formfield_is_indexed'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='formfield',
+            index=models.Index(fields=['form_template', 'order'], name='field_template_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='formtemplate',
+            index=models.Index(fields=['created_by', 'is_active', '-created_at'], name='template_user_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='formtemplate',
+            index=models.Index(models.F('created_by'), django.db.models.functions.text.Lower('name'), name='template_user_name_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-17 06:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forms', '0004_access_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='formfield',
+            name='filled_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='formtemplate',
+            name='active_employee_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='formtemplate',
+            name='counters_updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='formtemplate',
+            name='employee_count',
+            field=models.IntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-17 06:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forms', '0005_template_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FormTemplateVersion',
+            fields=[
+                ('schema_hash', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('version', models.PositiveIntegerField()),
+                ('schema', models.JSONField(default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('form_template', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='versions', to='forms.formtemplate')),
+            ],
+            options={
+                'verbose_name': 'Form Template Version',
+                'verbose_name_plural': 'Form Template Versions',
+                'ordering': ['form_template', '-version'],
+                'unique_together': {('form_template', 'version')},
+            },
+        ),
+        migrations.AddField(
+            model_name='formtemplate',
+            name='schema_version',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='forms.formtemplateversion'),
+        ),
+    ]
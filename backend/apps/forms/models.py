@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 from apps.authentication.models import CustomUser
 from django.core.exceptions import ValidationError
 
@@ -13,9 +14,41 @@ class FormTemplate(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
+    # Maintained by apps.employees.counters; see reconcile_template_counters
+    employee_count = models.IntegerField(default=0)
+    active_employee_count = models.IntegerField(default=0)
+    counters_updated_at = models.DateTimeField(blank=True, null=True)
+    # Snapshot of the current fields; cleared when a field changes and
+    # recreated on demand by apps.forms.versions
+    schema_version = models.ForeignKey(
+        "FormTemplateVersion",
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name="+",
+    )
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["created_by", "-created_at", "-id"],
+                name="template_user_created_idx",
+            ),
+            models.Index(
+                fields=["created_by", "-updated_at", "-id"],
+                name="template_user_updated_idx",
+            ),
+            models.Index(
+                fields=["created_by", "is_active", "-created_at"],
+                name="template_user_active_idx",
+            ),
+            models.Index(
+                "created_by",
+                Lower("name"),
+                name="template_user_name_idx",
+            ),
+        ]
         verbose_name = "Form Template"
         verbose_name_plural = "Form Templates"
 
@@ -24,10 +57,15 @@ class FormTemplate(models.Model):
 
     @property
     def field_count(self):
+        # Annotated by FormTemplateViewSet to avoid a COUNT per template
+        if hasattr(self, "num_fields"):
+            return self.num_fields
         return self.fields.count()
 
     @property
     def required_field_count(self):
+        if hasattr(self, "num_required_fields"):
+            return self.num_required_fields
         return self.fields.filter(is_required=True).count()
 
 
@@ -50,17 +88,32 @@ class FormField(models.Model):
     is_required = models.BooleanField(default=False)
     order = models.PositiveIntegerField(default=0)
     options = models.JSONField(default=list, blank=True)  # For SELECT type fields
+    is_indexed = models.BooleanField(default=False)  # Built by the sync_field_indexes command
+    filled_count = models.IntegerField(default=0)  # Employees with a non-blank value
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["order"]
         unique_together = ("form_template", "label")
+        indexes = [
+            models.Index(
+                fields=["form_template", "order"],
+                name="field_template_order_idx",
+            ),
+        ]
         verbose_name = "Form Field"
         verbose_name_plural = "Form Fields"
 
     def __str__(self):
         return f"{self.form_template.name} - {self.label}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets save signals see what changed without reading the row again.
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
     
     def clean(self):
         if self.field_type == "SELECT":
@@ -72,4 +125,26 @@ class FormField(models.Model):
     
     def save(self, *args, **kwargs):
         self.full_clean()  # This will call the clean method
-        super().save(*args, **kwargs)
\ No newline at end of file
+        super().save(*args, **kwargs)
+
+
+class FormTemplateVersion(models.Model):
+    """
+    Immutable snapshot of a template's fields, identified by its hash.
+    """
+    schema_hash = models.CharField(max_length=64, primary_key=True)
+    form_template = models.ForeignKey(
+        FormTemplate, on_delete=models.CASCADE, related_name="versions"
+    )
+    version = models.PositiveIntegerField()
+    schema = models.JSONField(default=list)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["form_template", "-version"]
+        unique_together = ("form_template", "version")
+        verbose_name = "Form Template Version"
+        verbose_name_plural = "Form Template Versions"
+
+    def __str__(self):
+        return f"{self.form_template.name} v{self.version}"
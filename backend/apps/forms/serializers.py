@@ -1,6 +1,9 @@
+from django.db.models import Value
+from django.db.models.functions import Lower
 from rest_framework import serializers
 from drf_spectacular.utils import extend_schema_serializer, OpenApiExample
-from .models import FormField, FormTemplate
+from .bulk import create_templates
+from .models import FormField, FormTemplate, FormTemplateVersion
 
 
 @extend_schema_serializer(
@@ -17,6 +20,8 @@ from .models import FormField, FormTemplate
                 "is_required": True,
                 "order": 0,
                 "options": [],
+                "is_indexed": False,
+                "filled_count": 120,
                 "created_at": "2024-01-01T00:00:00Z",
                 "updated_at": "2024-01-01T00:00:00Z"
             }
@@ -33,6 +38,8 @@ from .models import FormField, FormTemplate
                 "is_required": True,
                 "order": 1,
                 "options": ["IT", "HR", "Finance", "Marketing"],
+                "is_indexed": True,
+                "filled_count": 118,
                 "created_at": "2024-01-01T00:00:00Z",
                 "updated_at": "2024-01-01T00:00:00Z"
             }
@@ -57,10 +64,12 @@ class FormFieldSerializer(serializers.ModelSerializer):
             "is_required",
             "order",
             "options",
+            "is_indexed",
+            "filled_count",
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["id", "created_at", "updated_at"]
+        read_only_fields = ["id", "filled_count", "created_at", "updated_at"]
 
     def validate(self, attrs):
         field_type = attrs.get("field_type")
@@ -120,7 +129,9 @@ class FormFieldSerializer(serializers.ModelSerializer):
                     }
                 ],
                 "field_count": 2,
-                "required_field_count": 2
+                "required_field_count": 2,
+                "employee_count": 120,
+                "active_employee_count": 112
             }
         )
     ]
@@ -151,15 +162,27 @@ class FormTemplateSerializer(serializers.ModelSerializer):
             "fields",
             "field_count",
             "required_field_count",
+            "employee_count",
+            "active_employee_count",
+        ]
+        read_only_fields = [
+            "id",
+            "created_at",
+            "updated_at",
+            "created_by",
+            "employee_count",
+            "active_employee_count",
         ]
-        read_only_fields = ["id", "created_at", "updated_at", "created_by"]
 
     def validate_name(self, value):
         if not value.strip():
             raise serializers.ValidationError("Name cannot be empty or whitespace.")
 
-        queryset = FormTemplate.objects.filter(
-            name__iexact=value.strip(), created_by=self.context["request"].user
+        # Matches the (created_by, Lower(name)) index, unlike name__iexact.
+        # Both sides are folded by the database, whose LOWER may differ from
+        # str.lower() (SQLite only folds ASCII).
+        queryset = FormTemplate.objects.alias(name_lower=Lower("name")).filter(
+            created_by=self.context["request"].user, name_lower=Lower(Value(value.strip()))
         )
 
         if self.instance:
@@ -173,6 +196,57 @@ class FormTemplateSerializer(serializers.ModelSerializer):
         return value.strip()
 
 
+@extend_schema_serializer(
+    examples=[
+        OpenApiExample(
+            "Form Template Summary Example",
+            summary="Form template without fields",
+            description="A form template as returned by the list with ?summary=true",
+            value={
+                "id": 1,
+                "name": "Employee Registration Form",
+                "description": "Comprehensive form for new employee registration",
+                "created_by": "admin",
+                "created_at": "2024-01-01T00:00:00Z",
+                "updated_at": "2024-01-01T00:00:00Z",
+                "is_active": True,
+                "field_count": 2,
+                "required_field_count": 2,
+                "employee_count": 120,
+                "active_employee_count": 112
+            }
+        )
+    ]
+)
+class FormTemplateSummarySerializer(serializers.ModelSerializer):
+    """
+    Read-only form template serializer without the nested fields.
+
+    Used by the template list in summary mode, where only the metadata and
+    counts are needed and the fields are not fetched at all.
+    """
+    created_by = serializers.StringRelatedField(read_only=True)
+    field_count = serializers.ReadOnlyField()
+    required_field_count = serializers.ReadOnlyField()
+
+    class Meta:
+        model = FormTemplate
+        fields = [
+            "id",
+            "name",
+            "description",
+            "created_by",
+            "created_at",
+            "updated_at",
+            "is_active",
+            "field_count",
+            "required_field_count",
+            "employee_count",
+            "active_employee_count",
+        ]
+        read_only_fields = fields
+
+
 @extend_schema_serializer(
     examples=[
         OpenApiExample(
@@ -233,24 +307,58 @@ class FormTemplateCreateSerializer(serializers.ModelSerializer):
         read_only_fields = ["id"]
 
     def validate_fields(self, value):
+        # Each item was already validated by the nested FormFieldSerializer.
         if not value:
             raise serializers.ValidationError("At least one field is required.")
 
+        labels = set()
         for i, field_data in enumerate(value):
-            field_serializer = FormFieldSerializer(data=field_data)
-            if not field_serializer.is_valid():
+            if field_data["label"] in labels:
                 raise serializers.ValidationError(
-                    {f"Field {i+1}": field_serializer.errors}
+                    {f"Field {i+1}": {"label": ["Field labels must be unique."]}}
                 )
+            labels.add(field_data["label"])
         return value
 
     def create(self, validated_data):
-        fields_data = validated_data.pop("fields")
-        validated_data["created_by"] = self.context["request"].user
-        form_template = FormTemplate.objects.create(**validated_data)
+        return create_templates([validated_data], self.context["request"].user)[0]
 
-        for i, field_data in enumerate(fields_data):
-            field_data["order"] = i
-            FormField.objects.create(form_template=form_template, **field_data)
 
-        return form_template
+@extend_schema_serializer(
+    examples=[
+        OpenApiExample(
+            "Form Template Version Example",
+            summary="Immutable template schema",
+            description="Snapshot of a template's fields, addressed by its hash",
+            value={
+                "schema_hash": "9f2c4e0b7d1a...",
+                "form_template": 1,
+                "version": 3,
+                "schema": [
+                    {
+                        "id": 1,
+                        "field_type": "TEXT",
+                        "label": "Full Name",
+                        "placeholder": "Enter full name",
+                        "is_required": True,
+                        "order": 0,
+                        "options": []
+                    }
+                ],
+                "created_at": "2024-01-01T00:00:00Z"
+            }
+        )
+    ]
+)
+class FormTemplateVersionSerializer(serializers.ModelSerializer):
+    """
+    Read-only serializer for immutable form template schema versions.
+
+    A version never changes once created, so clients can cache it forever
+    under its schema_hash.
+    """
+
+    class Meta:
+        model = FormTemplateVersion
+        fields = ["schema_hash", "form_template", "version", "schema", "created_at"]
+        read_only_fields = fields
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from .models import FormField, FormTemplate
+
+
+# Sent by the reorder action, which moves fields with bulk_update and so
+# bypasses post_save. Arguments: form_template_id, fields (the moved ones).
+fields_reordered = Signal()
+
+
+@receiver([post_save, post_delete], sender=FormField)
+def expire_template_schema_version(sender, instance, **kwargs):
+    # The next reader snapshots the fields into a new version. Validators of
+    # older versions stay valid for the records written against them.
+    FormTemplate.objects.filter(pk=instance.form_template_id).update(
+        schema_version=None, updated_at=timezone.now()
+    )
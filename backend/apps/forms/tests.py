@@ -1,3 +1,336 @@
+from unittest import mock
+
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.authentication.models import CustomUser
+from apps.employees.models import Employee
+from apps.forms.models import FormField, FormTemplate, FormTemplateVersion
+from apps.forms.validation import validator_cache
+from apps.forms.versions import get_schema_version, snapshot_fields
+
+
+class FormTemplateListQueryCountTests(TestCase):
+    """
+    The template list must cost a constant number of queries, however many
+    templates and fields are on the page.
+    """
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            username="owner", email="owner@example.com", password="password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_templates(self, count):
+        for index in range(count):
+            template = FormTemplate.objects.create(
+                name=f"Template {FormTemplate.objects.count() + 1}",
+                created_by=self.user,
+            )
+            FormField.objects.create(
+                form_template=template, field_type="TEXT", label="Full Name",
+                is_required=True, order=0,
+            )
+            FormField.objects.create(
+                form_template=template, field_type="EMAIL", label="Email", order=1,
+            )
+
+    def assertConstantQueries(self, url, expected):
+        for count in (1, 5):
+            self.create_templates(count)
+            with self.assertNumQueries(expected):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_list_query_count(self):
+        # ETag state, page count, page, prefetched fields
+        response = self.assertConstantQueries("/api/forms/form-templates/", 4)
+
+        template = response.data["results"][0]
+        self.assertEqual(template["field_count"], 2)
+        self.assertEqual(template["required_field_count"], 1)
+        self.assertEqual(template["created_by"], "owner")
+        self.assertEqual(len(template["fields"]), 2)
+
+    def test_summary_list_query_count(self):
+        response = self.assertConstantQueries(
+            "/api/forms/form-templates/?summary=true", 3
+        )
+
+        template = response.data["results"][0]
+        self.assertNotIn("fields", template)
+        self.assertEqual(template["field_count"], 2)
+        self.assertEqual(template["required_field_count"], 1)
+
+
+class FormTemplateCloneTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            username="owner", email="owner@example.com", password="password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_template(self, name, field_count):
+        template = FormTemplate.objects.create(name=name, created_by=self.user)
+        for order in range(field_count):
+            FormField.objects.create(
+                form_template=template, field_type="TEXT", label=f"Field {order}",
+                is_required=order == 0, order=order,
+            )
+        return template
+
+    def test_clone_query_count_is_constant(self):
+        small = self.create_template("Small", 2)
+        large = self.create_template("Large", 20)
+
+        with self.assertNumQueries(9):
+            response = self.client.post(f"/api/forms/form-templates/{small.id}/clone/")
+        self.assertEqual(response.status_code, 201)
+
+        with self.assertNumQueries(9):
+            response = self.client.post(f"/api/forms/form-templates/{large.id}/clone/")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["name"], "Large (copy)")
+        self.assertEqual(response.data["field_count"], 20)
+        self.assertEqual(response.data["required_field_count"], 1)
+        self.assertEqual(
+            [field["label"] for field in response.data["fields"]],
+            [f"Field {order}" for order in range(20)],
+        )
+
+    def test_clone_names_follow_database_case_folding(self):
+        template = self.create_template("ÄBC", 1)
+
+        names = [
+            self.client.post(f"/api/forms/form-templates/{template.id}/clone/").data["name"]
+            for _ in range(2)
+        ]
+        self.assertEqual(names, ["ÄBC (copy)", "ÄBC (copy 2)"])
+
+
+class FormTemplateNameTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            username="owner", email="owner@example.com", password="password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_renaming_to_an_existing_name_is_rejected(self):
+        FormTemplate.objects.create(name="ÄBC", created_by=self.user)
+        FormTemplate.objects.create(name="Staff", created_by=self.user)
+        other = FormTemplate.objects.create(name="Other", created_by=self.user)
+
+        for name in ["ÄBC", " ÄBC ", "STAFF"]:
+            response = self.client.patch(
+                f"/api/forms/form-templates/{other.id}/", {"name": name}, format="json"
+            )
+            self.assertEqual(response.status_code, 400, name)
+            self.assertIn("name", response.data)
+
+        response = self.client.patch(
+            f"/api/forms/form-templates/{other.id}/", {"name": "Other"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+
+
+class FormTemplateVersionTests(TestCase):
+    """
+    Schema snapshots are immutable: editing a field creates a new version,
+    and records keep pointing at the version they were written against.
+    """
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            username="owner", email="owner@example.com", password="password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.template = FormTemplate.objects.create(name="Staff", created_by=self.user)
+        self.field = FormField.objects.create(
+            form_template=self.template, field_type="TEXT", label="Full Name", order=0,
+        )
+
+    def current_version(self):
+        return get_schema_version(FormTemplate.objects.get(pk=self.template.pk))
+
+    def test_field_edit_creates_a_new_version(self):
+        employee = Employee.objects.create(
+            form_template=self.template, created_by=self.user, data={str(self.field.id): "Ada"}
+        )
+        first = self.current_version()
+        self.assertEqual(employee.schema_version_id, first.pk)
+        self.assertEqual(self.current_version(), first)
+
+        self.field.label = "Name"
+        self.field.save()
+        self.assertIsNone(FormTemplate.objects.get(pk=self.template.pk).schema_version_id)
+
+        second = self.current_version()
+        self.assertNotEqual(second.pk, first.pk)
+        self.assertEqual((first.version, second.version), (1, 2))
+        first.refresh_from_db()
+        self.assertEqual(first.schema[0]["label"], "Full Name")
+        self.assertEqual(second.schema[0]["label"], "Name")
+        employee.refresh_from_db()
+        self.assertEqual(employee.schema_version_id, first.pk)
+
+    def test_non_schema_changes_reuse_the_version(self):
+        first = self.current_version()
+        self.field.is_indexed = True
+        self.field.save()
+
+        self.assertEqual(self.current_version(), first)
+        self.assertEqual(FormTemplateVersion.objects.count(), 1)
+
+    def test_versions_are_served_as_immutable(self):
+        version = self.current_version()
+        url = f"/api/forms/form-template-versions/{version.pk}/"
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["schema"], version.schema)
+        self.assertIn("immutable", response["Cache-Control"])
+        response = self.client.get(url, headers={"If-None-Match": response["ETag"]})
+        self.assertEqual(response.status_code, 304)
+
+    def test_field_edit_during_snapshot_leaves_the_template_expired(self):
+        def snapshot_then_edit(fields):
+            schema = snapshot_fields(fields)
+            # Another request edits a field after the fields were read.
+            FormField.objects.filter(pk=self.field.pk).update(label="Name")
+            FormTemplate.objects.filter(pk=self.template.pk).update(
+                schema_version=None, updated_at=timezone.now()
+            )
+            return schema
+
+        with mock.patch("apps.forms.versions.snapshot_fields", snapshot_then_edit):
+            stale = self.current_version()
+        self.assertEqual(stale.schema[0]["label"], "Full Name")
+        self.assertIsNone(FormTemplate.objects.get(pk=self.template.pk).schema_version_id)
+        self.assertEqual(self.current_version().schema[0]["label"], "Name")
+
+
+class TemplateValidatorCacheTests(TestCase):
+    """
+    Cached validators are keyed by schema version, so editing a field makes
+    the next write validate against the new schema.
+    """
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            username="owner", email="owner@example.com", password="password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.template = FormTemplate.objects.create(name="Staff", created_by=self.user)
+        self.field = FormField.objects.create(
+            form_template=self.template, field_type="NUMBER", label="Age", order=0,
+        )
+        validator_cache.clear()
+
+    def create_employee(self, data):
+        return self.client.post(
+            "/api/employees/employees/",
+            {"form_template": self.template.id, "data": data},
+            format="json",
+        )
+
+    def edit_field(self, **changes):
+        response = self.client.patch(
+            f"/api/forms/form-fields/{self.field.id}/", changes, format="json"
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def test_field_edit_invalidates_the_cached_validator(self):
+        self.assertEqual(self.create_employee({}).status_code, 201)
+        self.assertEqual(
+            self.create_employee({str(self.field.id): "abc"}).status_code, 400
+        )
+
+        self.edit_field(is_required=True)
+        response = self.create_employee({})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Age is required", str(response.data))
+
+        self.edit_field(field_type="TEXT")
+        self.assertEqual(
+            self.create_employee({str(self.field.id): "abc"}).status_code, 201
+        )
+
+
+class FormFieldReorderTests(TestCase):
+    """
+    The reorder action moves every field of a template in one request and
+    rejects anything but the template's own field ids, each exactly once.
+    """
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            username="owner", email="owner@example.com", password="password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.template = FormTemplate.objects.create(name="Staff", created_by=self.user)
+        self.fields = [
+            FormField.objects.create(
+                form_template=self.template, field_type="TEXT", label=label, order=order,
+            )
+            for order, label in enumerate(["Full Name", "Email", "Team"])
+        ]
+
+    def reorder(self, field_ids, template_id=None):
+        return self.client.post(
+            f"/api/forms/form-templates/{template_id or self.template.id}/reorder/",
+            {"field_ids": field_ids},
+            format="json",
+        )
+
+    def test_reorder_writes_only_moved_fields(self):
+        name, email, team = self.fields
+        version = get_schema_version(self.template)
+
+        response = self.reorder([name.id, team.id, email.id])
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.data["updated_count"], 2)
+        self.assertEqual(
+            [field["label"] for field in response.data["fields"]], ["Full Name", "Team", "Email"]
+        )
+        self.assertEqual(
+            list(self.template.fields.order_by("order").values_list("label", flat=True)),
+            ["Full Name", "Team", "Email"],
+        )
+        template = FormTemplate.objects.get(pk=self.template.pk)
+        self.assertIsNone(template.schema_version_id)
+        self.assertNotEqual(get_schema_version(template), version)
+
+    def test_invalid_field_ids_are_rejected(self):
+        name, email, team = self.fields
+        for field_ids in [
+            [],
+            [name.id, email.id],
+            [name.id, email.id, email.id],
+            [name.id, email.id, team.id + 100],
+            [[name.id], email.id, team.id],
+            [str(name.id), email.id, team.id],
+        ]:
+            response = self.reorder(field_ids)
+            self.assertEqual(response.status_code, 400, field_ids)
+        self.assertEqual(
+            list(self.template.fields.order_by("order").values_list("id", flat=True)),
+            [name.id, email.id, team.id],
+        )
 
-# Create your tests here.
+    def test_other_users_template_is_not_found(self):
+        other = CustomUser.objects.create_user(
+            username="other", email="other@example.com", password="password"
+        )
+        self.client.force_authenticate(other)
+        response = self.reorder([field.id for field in self.fields])
+        self.assertEqual(response.status_code, 404)
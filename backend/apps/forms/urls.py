@@ -1,10 +1,13 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from apps.forms.views import FormTemplateViewSet, FormFieldViewSet
+from apps.forms.views import FormTemplateViewSet, FormTemplateVersionViewSet, FormFieldViewSet
 
 router = DefaultRouter()
 router.register(r"form-templates", FormTemplateViewSet, basename="form-template")
 router.register(r"form-fields", FormFieldViewSet, basename="form-field")
+router.register(
+    r"form-template-versions", FormTemplateVersionViewSet, basename="form-template-version"
+)
 
 urlpatterns = [
     path("", include(router.urls)),
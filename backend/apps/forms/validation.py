@@ -0,0 +1,166 @@
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from django.conf import settings
+
+from .versions import get_schema_version
+
+
+EMAIL_PATTERN = re.compile(r"^[^\s@]+@[^\s@]+\.[^\s@]+$")
+DATE_FORMAT = "%Y-%m-%d"
+NAME_FIELDS = ("name", "full_name", "first_name", "employee_name")
+
+
+class CompiledField:
+    """
+    Immutable, query-free view of a single schema field used during validation.
+    """
+
+    __slots__ = (
+        "id", "key", "label", "field_type", "is_required", "options", "option_set", "is_name",
+    )
+
+    def __init__(self, field):
+        self.id = field["id"]
+        self.key = str(field["id"])
+        self.label = field["label"]
+        self.field_type = field["field_type"]
+        self.is_required = field["is_required"]
+        self.options = list(field["options"] or [])
+        self.option_set = frozenset(self.options)
+        self.is_name = is_name_label(self.label)
+
+    def get_value(self, data):
+        value = data.get(self.key)
+        if value is None:
+            value = data.get(self.id)
+        return value
+
+
+class TemplateValidator:
+    """
+    Validator compiled once per FormTemplateVersion.
+
+    Holds the ordered field list with precompiled checks so that validating
+    an employee record costs no queries and a single pass over the fields.
+    """
+
+    def __init__(self, template_id, version, schema):
+        self.template_id = template_id
+        self.version = version
+        self.fields = tuple(CompiledField(field) for field in schema)
+        self.name_fields = tuple(field for field in self.fields if field.is_name)
+
+    def display_name(self, data):
+        for field in self.name_fields:
+            value = field.get_value(data)
+            if value:
+                return str(value)
+        return ""
+
+    def validate(self, data):
+        errors = []
+
+        for field in self.fields:
+            value = field.get_value(data)
+            is_blank = not value or str(value).strip() == ""
+
+            if field.is_required and is_blank:
+                errors.append(f"{field.label} is required")
+                continue
+
+            if is_blank:
+                continue
+
+            if field.field_type == "EMAIL":
+                if not EMAIL_PATTERN.match(str(value)):
+                    errors.append(f"{field.label} must be a valid email")
+
+            elif field.field_type == "NUMBER":
+                try:
+                    float(value)
+                except (ValueError, TypeError):
+                    errors.append(f"{field.label} must be a valid number")
+
+            elif field.field_type == "DATE":
+                try:
+                    datetime.strptime(str(value), DATE_FORMAT)
+                except ValueError:
+                    errors.append(f"{field.label} must be a valid date (YYYY-MM-DD)")
+
+            elif field.field_type == "SELECT":
+                if field.option_set and not _is_option(value, field.option_set):
+                    errors.append(f"{field.label} must be one of: {', '.join(field.options)}")
+
+        return errors
+
+
+def is_name_label(label):
+    label = label.lower()
+    return any(name in label for name in NAME_FIELDS)
+
+
+def _is_option(value, option_set):
+    try:
+        return value in option_set
+    except TypeError:
+        # Unhashable values (lists, dicts) can never match a string option.
+        return False
+
+
+class TemplateValidatorCache:
+    """
+    Process-local LRU of compiled validators keyed by schema version hash.
+
+    Versions are immutable, so entries never need invalidating; they are
+    only evicted when the cache is full.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, version):
+        with self._lock:
+            entry = self._entries.get(version)
+            if entry is not None:
+                self._entries.move_to_end(version)
+            return entry
+
+    def set(self, validator):
+        with self._lock:
+            self._entries[validator.version] = validator
+            self._entries.move_to_end(validator.version)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+validator_cache = TemplateValidatorCache(
+    maxsize=getattr(settings, "FORM_VALIDATOR_CACHE_SIZE", 256)
+)
+
+
+def compile_version(version):
+    return TemplateValidator(version.form_template_id, version.pk, version.schema)
+
+
+def get_template_validator(template):
+    """
+    Validator for the current schema version of ``template``.
+
+    Costs no queries once the version is cached and ``template`` points at it.
+    """
+    validator = None
+    if template.schema_version_id is not None:
+        validator = validator_cache.get(template.schema_version_id)
+    if validator is None:
+        validator = compile_version(get_schema_version(template))
+        validator_cache.set(validator)
+    return validator
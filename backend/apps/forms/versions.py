@@ -0,0 +1,92 @@
+import hashlib
+import json
+
+from django.db import IntegrityError, transaction
+from django.db.models import Max
+
+from .models import FormField, FormTemplate, FormTemplateVersion
+
+
+# FormField attributes that make up a schema; anything else (timestamps,
+# counters, index flags) can change without creating a new version.
+SCHEMA_ATTRIBUTES = (
+    "id", "field_type", "label", "placeholder", "is_required", "order", "options",
+)
+
+
+def snapshot_fields(fields):
+    fields = sorted(fields, key=lambda field: (field.order, field.id))
+    return [
+        {name: getattr(field, name) for name in SCHEMA_ATTRIBUTES} for field in fields
+    ]
+
+
+def schema_hash(template_id, schema):
+    payload = json.dumps(
+        {"template": template_id, "fields": schema}, sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def get_schema_version(template):
+    """
+    The current FormTemplateVersion of ``template``, snapshotting its fields
+    first if they changed since the last snapshot.
+    """
+    if template.schema_version_id is not None:
+        return template.schema_version
+    return create_schema_version(template)
+
+
+def create_schema_version(template):
+    """
+    Snapshot the fields into a version and make it the template's current one.
+
+    A field edit expires ``schema_version`` with an UPDATE of the template
+    row that also bumps ``updated_at``. The row is locked before the fields
+    are read, so a concurrent edit either commits first (and the snapshot
+    sees it) or waits and expires the version assigned here; the version is
+    only assigned if ``updated_at`` has not moved since, for engines where
+    the lock is a no-op.
+    """
+    with transaction.atomic():
+        row = FormTemplate.objects.select_for_update().filter(
+            pk=template.pk
+        ).values_list("schema_version_id", "updated_at").first()
+        if row is not None and row[0] is not None:
+            # Snapshotted by another request while this one waited.
+            version = FormTemplateVersion.objects.get(pk=row[0])
+        else:
+            version = get_or_create_version(
+                template.pk,
+                snapshot_fields(FormField.objects.filter(form_template_id=template.pk)),
+            )
+            if row is not None:
+                FormTemplate.objects.filter(
+                    pk=template.pk, schema_version__isnull=True, updated_at=row[1]
+                ).update(schema_version=version)
+
+    template.schema_version = version
+    return version
+
+
+def get_or_create_version(template_id, schema):
+    digest = schema_hash(template_id, schema)
+
+    version = FormTemplateVersion.objects.filter(pk=digest).first()
+    if version is None:
+        try:
+            with transaction.atomic():
+                number = FormTemplateVersion.objects.filter(
+                    form_template_id=template_id
+                ).aggregate(Max("version"))["version__max"] or 0
+                version = FormTemplateVersion.objects.create(
+                    schema_hash=digest,
+                    form_template_id=template_id,
+                    version=number + 1,
+                    schema=schema,
+                )
+        except IntegrityError:
+            # Snapshotted concurrently by another request.
+            version = FormTemplateVersion.objects.get(pk=digest)
+    return version
@@ -1,18 +1,26 @@
-from rest_framework import viewsets
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import FormTemplate, FormField
+from django.conf import settings
+from .bulk import clone_template, create_templates, reorder_fields
+from .models import FormTemplate, FormField, FormTemplateVersion
 from .serializers import (
     FormTemplateSerializer,
     FormTemplateCreateSerializer,
+    FormTemplateSummarySerializer,
+    FormTemplateVersionSerializer,
     FormFieldSerializer,
 )
 from rest_framework.exceptions import PermissionDenied
 from django.db import models
+from employee_management.asynchronous import AsyncReadMixin
+from employee_management.conditional import ConditionalGetMixin
 
 
-class FormTemplateViewSet(viewsets.ModelViewSet):
+class FormTemplateViewSet(AsyncReadMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     search_fields = ["name", "description"]
@@ -21,16 +29,191 @@ class FormTemplateViewSet(viewsets.ModelViewSet):
     ordering = ["-created_at"]
 
     def get_queryset(self):
-        return FormTemplate.objects.filter(created_by=self.request.user)
+        queryset = FormTemplate.objects.filter(created_by=self.request.user)
+        if self.request.method not in ("GET", "HEAD"):
+            return queryset
+        return self.with_related(queryset, fields=not self.is_summary())
+
+    def with_related(self, queryset, fields=True):
+        # Counts, owner and fields for the whole page in a constant number
+        # of queries instead of four per template.
+        queryset = queryset.select_related("created_by").annotate(
+            num_fields=models.Count("fields"),
+            num_required_fields=models.Count(
+                "fields", filter=models.Q(fields__is_required=True)
+            ),
+        )
+        if fields:
+            queryset = queryset.prefetch_related("fields")
+        return queryset
+
+    def is_summary(self):
+        return self.action == "list" and self.request.query_params.get(
+            "summary", ""
+        ).lower() in ["true", "1"]
+
+    def get_cache_validators(self):
+        queryset = FormTemplate.objects.filter(created_by=self.request.user)
+        if self.action == "retrieve":
+            if not str(self.kwargs.get("pk", "")).isdigit():
+                return None
+            row = queryset.filter(pk=self.kwargs.get("pk")).values_list(
+                "updated_at", "counters_updated_at"
+            ).first()
+            return (row, max(value for value in row if value)) if row else None
+
+        aggregate = queryset.aggregate(
+            last_modified=models.Max("updated_at"),
+            counters_modified=models.Max("counters_updated_at"),
+            count=models.Count("id"),
+        )
+        state = (aggregate["count"], aggregate["last_modified"], aggregate["counters_modified"])
+        # No Last-Modified: deleting a row leaves max(updated_at) unchanged,
+        # so If-Modified-Since would answer 304 with a stale list.
+        return state, None
 
     def get_serializer_class(self):
         if self.action == "create":
             return FormTemplateCreateSerializer
+        if self.is_summary():
+            return FormTemplateSummarySerializer
         return FormTemplateSerializer
 
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
 
+    @action(detail=False, methods=["post"])
+    def bulk_create(self, request):
+        """
+        Create many templates with their fields in one request.
+
+        All templates are validated first; if any is invalid nothing is
+        created. Templates and fields are then inserted with one
+        ``bulk_create`` each.
+        """
+        items = request.data
+        if isinstance(items, dict):
+            items = items.get("templates")
+
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"error": "A non-empty list of form templates is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        max_templates = getattr(settings, "FORM_TEMPLATE_BULK_MAX_TEMPLATES", 500)
+        if len(items) > max_templates:
+            return Response(
+                {"error": f"At most {max_templates} form templates can be created per request"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        serializer = FormTemplateCreateSerializer(
+            data=items, many=True, context=self.get_serializer_context()
+        )
+        if not serializer.is_valid():
+            errors = [
+                {"index": index, "errors": item_errors}
+                for index, item_errors in enumerate(serializer.errors)
+                if item_errors
+            ]
+            return Response({
+                "created_count": 0,
+                "error_count": len(errors),
+                "errors": errors,
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        templates = create_templates(serializer.validated_data, request.user)
+        return Response({
+            "message": f"Successfully created {len(templates)} form templates",
+            "created_count": len(templates),
+            "template_ids": [template.id for template in templates],
+        }, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=["post"])
+    def reorder(self, request, pk=None):
+        """
+        Reorder all fields of a template at once from an ordered list of ids.
+        """
+        field_ids = request.data.get("field_ids") if isinstance(request.data, dict) else None
+        if not isinstance(field_ids, list) or not field_ids or not all(
+            isinstance(field_id, int) and not isinstance(field_id, bool)
+            for field_id in field_ids
+        ):
+            return Response(
+                {"error": "field_ids must be a non-empty list of field ids"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # One query checks ownership and loads every field of the template.
+        fields = str(pk).isdigit() and list(FormField.objects.filter(
+            form_template_id=pk, form_template__created_by=request.user
+        ))
+        if not fields:
+            return Response(
+                {"error": "Form template not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        if len(set(field_ids)) != len(field_ids) or set(field_ids) != {
+            field.id for field in fields
+        }:
+            return Response(
+                {"error": "field_ids must list every field of the template exactly once"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        moved = reorder_fields(fields, field_ids)
+        fields.sort(key=lambda field: field.order)
+        return Response({
+            "message": f"Reordered {len(moved)} fields",
+            "updated_count": len(moved),
+            "fields": FormFieldSerializer(fields, many=True).data,
+        })
+
+    @action(detail=True, methods=["post"])
+    def clone(self, request, pk=None):
+        template = self.get_object()
+        name = request.data.get("name")
+
+        if name is not None:
+            serializer = FormTemplateSerializer(
+                data={"name": name}, partial=True, context=self.get_serializer_context()
+            )
+            serializer.is_valid(raise_exception=True)
+            name = serializer.validated_data["name"]
+
+        clone = clone_template(template, request.user, name)
+        clone = self.with_related(FormTemplate.objects.filter(pk=clone.pk)).get()
+        return Response(
+            FormTemplateSerializer(clone, context=self.get_serializer_context()).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class FormTemplateVersionViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Immutable schema snapshots of the user's templates, addressed by hash.
+    """
+    serializer_class = FormTemplateVersionSerializer
+    permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ["form_template"]
+    lookup_value_regex = "[0-9a-f]{64}"
+    conditional_actions = ("retrieve",)
+    immutable_actions = ("retrieve",)
+
+    def get_queryset(self):
+        return FormTemplateVersion.objects.filter(
+            form_template__created_by=self.request.user
+        )
+
+    def get_cache_validators(self):
+        created_at = self.get_queryset().filter(pk=self.kwargs.get("pk")).values_list(
+            "created_at", flat=True
+        ).first()
+        return (self.kwargs["pk"], created_at) if created_at else None
+
 
 class FormFieldViewSet(viewsets.ModelViewSet):
     serializer_class = FormFieldSerializer
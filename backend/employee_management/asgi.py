@@ -12,5 +12,8 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'employee_management.settings')
+# Under ASGI the read-heavy endpoints run as coroutines (see
+# employee_management.asynchronous); set ASYNC_READ_VIEWS=False to opt out.
+os.environ.setdefault('ASYNC_READ_VIEWS', 'True')
 
 application = get_asgi_application()
@@ -0,0 +1,91 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+
+class NotModified(Exception):
+    def __init__(self, response):
+        super().__init__("Not modified")
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """
+    Answers ``If-None-Match`` / ``If-Modified-Since`` on list and detail GETs
+    with 304 before any queryset is evaluated or serialized.
+
+    Views implement ``get_cache_validators()`` returning ``(state, last_modified)``
+    from a cheap aggregate; ``state`` is any value that changes whenever the
+    response would. ``None`` skips conditional handling (e.g. for a 404).
+    The views derive ``state`` from ``updated_at``, so writes that bypass
+    ``save()`` (``update()``, ``bulk_update()``) must set it themselves.
+    Return ``last_modified=None`` when no timestamp moves on every change,
+    such as a collection that rows can be deleted from; only the ETag is
+    sent then.
+    """
+
+    conditional_actions = ("list", "retrieve")
+    # Actions whose response can never change for a given URL; clients may
+    # reuse them without revalidating.
+    immutable_actions = ()
+
+    def get_cache_validators(self):
+        raise NotImplementedError
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.cache_validators = None
+        if request.method not in ("GET", "HEAD") or self.action not in self.conditional_actions:
+            return
+
+        validators = self.get_cache_validators()
+        if validators is None:
+            return
+
+        state, last_modified = validators
+        etag = self.build_etag(request, state)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        self.cache_validators = (etag, timestamp)
+
+        response = get_conditional_response(
+            request._request, etag=etag, last_modified=timestamp
+        )
+        if response is not None:
+            raise NotModified(self.add_cache_headers(response))
+
+    def build_etag(self, request, state):
+        source = "|".join([
+            str(request.user.pk),
+            request.path,
+            request.GET.urlencode(),
+            request.accepted_media_type or "",
+            repr(state),
+        ])
+        return quote_etag(hashlib.md5(source.encode(), usedforsecurity=False).hexdigest())
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if getattr(self, "cache_validators", None) and response.status_code == 200:
+            self.add_cache_headers(response)
+        return response
+
+    def add_cache_headers(self, response):
+        etag, timestamp = self.cache_validators
+        response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+        if self.action in self.immutable_actions:
+            patch_cache_control(response, private=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+        else:
+            patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ["Authorization"])
+        return response
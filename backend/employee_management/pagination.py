@@ -0,0 +1,211 @@
+import base64
+import json
+from collections import OrderedDict
+
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over ``(<timestamp>, id)``.
+
+    Each page is fetched with a ``WHERE (ts, id) < (:ts, :id)`` range
+    condition on an indexed key instead of ``COUNT(*)`` plus ``OFFSET``, so
+    deep pages cost the same as the first one. A ``previous`` cursor seeks
+    the other way from the first row and flips the page back.
+    """
+
+    cursor_query_param = "cursor"
+    ordering_param = "ordering"
+    keyset_fields = ("created_at", "updated_at")
+    default_ordering = "-created_at"
+    page_size = None
+
+    def __init__(self, page_size=None):
+        if page_size is not None:
+            self.page_size = page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.page_queryset(queryset, request)
+        return self.set_page(list(queryset[: self.page_size + 1]))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset = self.page_queryset(queryset, request)
+        return self.set_page([obj async for obj in queryset[: self.page_size + 1]])
+
+    def page_queryset(self, queryset, request):
+        self.request = request
+        self.ordering = self.get_ordering(request)
+        field = self.ordering.lstrip("-")
+        descending = self.ordering.startswith("-")
+
+        position = self.decode_cursor(request)
+        self.has_cursor = position is not None
+        self.reverse = False
+        if position is not None:
+            value, pk, self.reverse = position
+            if self.reverse:
+                descending = not descending
+            if descending:
+                queryset = queryset.filter(
+                    Q(**{f"{field}__lt": value}) | Q(**{field: value, "id__lt": pk})
+                )
+            else:
+                queryset = queryset.filter(
+                    Q(**{f"{field}__gt": value}) | Q(**{field: value, "id__gt": pk})
+                )
+
+        prefix = "-" if descending else ""
+        return queryset.order_by(f"{prefix}{field}", f"{prefix}id")
+
+    def set_page(self, results):
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        if self.reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.has_cursor
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ("next", self.get_next_link()),
+            ("previous", self.get_previous_link()),
+            ("results", data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_ordering(self, request):
+        ordering = request.query_params.get(self.ordering_param, self.default_ordering).strip()
+        if ordering.lstrip("-") not in self.keyset_fields:
+            raise ValidationError({
+                self.ordering_param: (
+                    "Cursor pagination supports ordering by: "
+                    + ", ".join(self.keyset_fields)
+                )
+            })
+        return ordering
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.cursor_link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.cursor_link(self.page[0], reverse=True)
+
+    def cursor_link(self, obj, reverse):
+        value = getattr(obj, self.ordering.lstrip("-"))
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(value, obj.pk, reverse)
+        )
+
+    def encode_cursor(self, value, pk, reverse=False):
+        payload = [self.ordering, value.isoformat(), pk]
+        if reverse:
+            payload.append(True)
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            ordering, value, pk, *reverse = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            value = parse_datetime(value)
+            pk = int(pk)
+        except (TypeError, ValueError):
+            raise NotFound("Invalid cursor")
+        if value is None or ordering != self.ordering or reverse not in ([], [True]):
+            raise NotFound("Invalid cursor")
+        return value, pk, bool(reverse)
+
+
+class DefaultPagination(PageNumberPagination):
+    """
+    Page number pagination by default; clients opt in to keyset pagination
+    with ``?pagination=cursor`` (or by following a ``cursor`` link).
+    """
+
+    mode_query_param = "pagination"
+    keyset_class = KeysetPagination
+    keyset = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_keyset(request):
+            self.keyset = self.keyset_class(page_size=self.get_page_size(request))
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        ``paginate_queryset`` for async views: the count and the page are
+        fetched with the async ORM.
+        """
+        if self.use_keyset(request):
+            self.keyset = self.keyset_class(page_size=self.get_page_size(request))
+            return await self.keyset.apaginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        # Paginator.count is a cached_property; prime it so page() needs no query.
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            ))
+
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+
+        self.page.object_list = [obj async for obj in self.page.object_list]
+        return list(self.page)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def use_keyset(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == "cursor"
+            or self.keyset_class.cursor_query_param in request.query_params
+        )
+
+    def get_next_link(self):
+        if self.keyset is not None:
+            return self.keyset.get_next_link()
+        return super().get_next_link()
+
+    def get_previous_link(self):
+        if self.keyset is not None:
+            return self.keyset.get_previous_link()
+        return super().get_previous_link()
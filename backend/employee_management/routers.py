@@ -0,0 +1,28 @@
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class PrimaryReplicaRouter:
+    """
+    Send reads to the read-only ``replica`` alias and writes to ``default``.
+
+    Reads issued inside a transaction on ``default`` stay on ``default`` so
+    they see that transaction's own writes (and ``select_for_update`` keeps
+    its lock on the connection that will write).
+    """
+
+    replica_alias = "replica"
+
+    def db_for_read(self, model, **hints):
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return self.replica_alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases are connections to the same database file.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -93,6 +93,50 @@ DATABASES = {
     }
 }
 
+# Set POSTGRES_DB to run on PostgreSQL (requirements-postgresql.txt) instead.
+POSTGRES_DB = config("POSTGRES_DB", default="")
+if POSTGRES_DB:
+    DATABASES["default"] = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": POSTGRES_DB,
+        "USER": config("POSTGRES_USER", default="postgres"),
+        "PASSWORD": config("POSTGRES_PASSWORD", default=""),
+        "HOST": config("POSTGRES_HOST", default="localhost"),
+        "PORT": config("POSTGRES_PORT", default="5432"),
+    }
+
+# On SQLite, "production" applies SQLITE_PRAGMAS on every connection and
+# routes reads to a query-only "replica" alias of the same file, so
+# list/search traffic reads WAL snapshots instead of waiting behind bulk writes.
+DATABASE_PROFILE = config("DATABASE_PROFILE", default="development")
+
+SQLITE_PRAGMAS = [
+    f"PRAGMA busy_timeout={config('SQLITE_BUSY_TIMEOUT', default=5000, cast=int)}",
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    f"PRAGMA mmap_size={config('SQLITE_MMAP_SIZE', default=268435456, cast=int)}",
+    # Negative values are KiB: -65536 is a 64 MiB page cache per connection.
+    f"PRAGMA cache_size={config('SQLITE_CACHE_SIZE', default=-65536, cast=int)}",
+]
+
+if DATABASE_PROFILE == "production" and not POSTGRES_DB:
+    DATABASES["default"].update({
+        "CONN_MAX_AGE": config("CONN_MAX_AGE", default=600, cast=int),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "init_command": ";".join(SQLITE_PRAGMAS),
+            # Take the write lock when the transaction starts instead of
+            # failing to upgrade a read lock halfway through it.
+            "transaction_mode": "IMMEDIATE",
+        },
+    })
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "OPTIONS": {"init_command": ";".join([*SQLITE_PRAGMAS, "PRAGMA query_only=ON"])},
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_ROUTERS = ["employee_management.routers.PrimaryReplicaRouter"]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -144,7 +188,7 @@ AUTH_USER_MODEL = "authentication.CustomUser"
 # REST Framework settings
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.authentication.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
@@ -152,12 +196,50 @@ REST_FRAMEWORK = {
     "DEFAULT_RENDERER_CLASSES": [
         "rest_framework.renderers.JSONRenderer",
     ],
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "employee_management.pagination.DefaultPagination",
     "PAGE_SIZE": 20,
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
 APPEND_SLASH = False
+
+# Serve read-heavy list/retrieve actions as async views; enabled by asgi.py.
+ASYNC_READ_VIEWS = config("ASYNC_READ_VIEWS", default=False, cast=bool)
+
+# Dynamic form settings
+FORM_VALIDATOR_CACHE_SIZE = config("FORM_VALIDATOR_CACHE_SIZE", default=256, cast=int)
+FORM_TEMPLATE_BULK_MAX_TEMPLATES = config("FORM_TEMPLATE_BULK_MAX_TEMPLATES", default=500, cast=int)
+EMPLOYEE_BULK_CHUNK_SIZE = config("EMPLOYEE_BULK_CHUNK_SIZE", default=500, cast=int)
+EMPLOYEE_BULK_MAX_ROWS = config("EMPLOYEE_BULK_MAX_ROWS", default=5000, cast=int)
+EMPLOYEE_EXPORT_CHUNK_SIZE = config("EMPLOYEE_EXPORT_CHUNK_SIZE", default=2000, cast=int)
+# Hard cap for by_template/search responses requested without envelope=template.
+EMPLOYEE_COLLECTION_MAX_RESULTS = config("EMPLOYEE_COLLECTION_MAX_RESULTS", default=1000, cast=int)
+EMPLOYEE_PURGE_CHUNK_SIZE = config("EMPLOYEE_PURGE_CHUNK_SIZE", default=500, cast=int)
+# Run purge jobs in a background thread of the web process; disable when
+# a separate `manage.py purge_employees --loop` worker is deployed.
+EMPLOYEE_PURGE_IN_PROCESS = config("EMPLOYEE_PURGE_IN_PROCESS", default=True, cast=bool)
+# Seconds without progress after which a RUNNING purge job is treated as
+# abandoned and picked up again by `manage.py purge_employees`.
+EMPLOYEE_PURGE_STALE_AFTER = config("EMPLOYEE_PURGE_STALE_AFTER", default=300, cast=int)
+# Recompute display names after a name field changes in a background thread
+# of the web process. If the process exits first, run
+# `manage.py backfill_display_names`.
+EMPLOYEE_DISPLAY_NAME_REFRESH_IN_BACKGROUND = config(
+    "EMPLOYEE_DISPLAY_NAME_REFRESH_IN_BACKGROUND", default=True, cast=bool
+)
+# Dotted path to an apps.employees.search backend; chosen from the database vendor when empty.
+EMPLOYEE_SEARCH_BACKEND = config("EMPLOYEE_SEARCH_BACKEND", default="")
+
+# Authenticated users are cached per process for this many seconds (0 disables).
+AUTH_USER_CACHE_TTL = config("AUTH_USER_CACHE_TTL", default=30, cast=int)
+AUTH_USER_CACHE_SIZE = config("AUTH_USER_CACHE_SIZE", default=1024, cast=int)
+# Seconds between catching up with tokens blacklisted by other processes.
+TOKEN_BLACKLIST_SYNC_INTERVAL = config("TOKEN_BLACKLIST_SYNC_INTERVAL", default=2.0, cast=float)
+# Each catch-up re-reads this many seconds before the previous one, for
+# transactions that commit late; every Nth catch-up reloads everything.
+TOKEN_BLACKLIST_SYNC_OVERLAP = config("TOKEN_BLACKLIST_SYNC_OVERLAP", default=60.0, cast=float)
+TOKEN_BLACKLIST_FULL_SYNC_EVERY = config("TOKEN_BLACKLIST_FULL_SYNC_EVERY", default=30, cast=int)
+
 # Simple JWT settings
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
@@ -180,6 +262,7 @@ SIMPLE_JWT = {
     "AUTH_TOKEN_CLASSES": ("rest_framework_simplejwt.tokens.AccessToken",),
     "TOKEN_TYPE_CLAIM": "token_type",
     "TOKEN_USER_CLASS": "rest_framework_simplejwt.models.TokenUser",
+    "TOKEN_REFRESH_SERIALIZER": "apps.authentication.serializers.FilteredTokenRefreshSerializer",
     "JTI_CLAIM": "jti",
     "SLIDING_TOKEN_REFRESH_EXP_CLAIM": "refresh_exp",
     "SLIDING_TOKEN_LIFETIME": timedelta(minutes=5),
@@ -232,7 +315,7 @@ SPECTACULAR_SETTINGS = {
     "COMPONENT_SPLIT_REQUEST": True,
     "SCHEMA_PATH_PREFIX": "/api/",
     "AUTHENTICATION_WHITELIST": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.authentication.authentication.CachedJWTAuthentication",
     ],
     "SERVERS": [
         {
@@ -0,0 +1,32 @@
+#!/usr/bin/env bash
+# Run the backend test suite against a throwaway PostgreSQL cluster.
+#
+# Needs the PostgreSQL server binaries (initdb, pg_ctl) on PATH and the
+# PostgreSQL requirements (pip install -r requirements-postgresql.txt).
+# The cluster lives in a temporary directory, only listens on a Unix
+# socket there, and is removed on exit. Arguments go to `manage.py test`:
+#
+#     scripts/test_postgresql.sh apps.employees
+set -euo pipefail
+
+cd "$(dirname "$0")/.."
+
+CLUSTER_DIR="$(mktemp -d)"
+PORT="${POSTGRES_TEST_PORT:-55432}"
+
+cleanup() {
+    pg_ctl -D "$CLUSTER_DIR/data" -m immediate stop >/dev/null 2>&1 || true
+    rm -rf "$CLUSTER_DIR"
+}
+trap cleanup EXIT
+
+initdb -D "$CLUSTER_DIR/data" -U postgres -A trust --no-sync >/dev/null
+pg_ctl -D "$CLUSTER_DIR/data" -l "$CLUSTER_DIR/postgresql.log" -w start \
+    -o "-p $PORT -k $CLUSTER_DIR -c listen_addresses='' -c fsync=off" >/dev/null
+
+POSTGRES_DB=employee_management \
+POSTGRES_USER=postgres \
+POSTGRES_HOST="$CLUSTER_DIR" \
+POSTGRES_PORT="$PORT" \
+SECRET_KEY="${SECRET_KEY:-test-secret-key}" \
+    python manage.py test "${@:-apps}"